@@ -5,22 +5,24 @@ Demonstrates fuzzy traffic light control with SUMO simulation
 
 import os
 import sys
+import argparse
 from pathlib import Path
 
+import numpy as np
+
 # Add src to path
 src_path = Path(__file__).parent.parent / "src"
 sys.path.insert(0, str(src_path))
 
-from fuzzy_controller.membership_functions import create_membership_functions
-from fuzzy_controller.fuzzy_rules import create_fuzzy_rules
-from fuzzy_controller.controller import FuzzyTrafficController
+from fuzzy_controller.controller import FuzzyTrafficController, TrafficStateArray
 from simulation.sumo_simulator import SUMOSimulator, check_sumo_installation
 
 
 def run_fuzzy_sumo_demo(
     sumo_cfg: str,
     simulation_duration: int = 600,
-    use_gui: bool = True
+    use_gui: bool = True,
+    backend: str = "traci"
 ):
     """
     Run fuzzy traffic controller with SUMO
@@ -29,6 +31,7 @@ def run_fuzzy_sumo_demo(
         sumo_cfg: Path to SUMO configuration file
         simulation_duration: Total simulation time in seconds
         use_gui: Whether to show SUMO GUI
+        backend: "traci" or "libsumo" (in-process, headless only)
     """
     print("=" * 60)
     print("FUZZY TRAFFIC CONTROLLER + SUMO DEMO")
@@ -44,9 +47,11 @@ def run_fuzzy_sumo_demo(
     # Initialize fuzzy controller
     print("\n[2/5] Initializing fuzzy traffic controller...")
     try:
-        membership_funcs, green_time = create_membership_functions()
-        fuzzy_rules = create_fuzzy_rules(membership_funcs, green_time)
-        controller = FuzzyTrafficController(membership_funcs, green_time, fuzzy_rules)
+        # Reuse the last green time while traffic stays within
+        # 5 vehicles / 10 s of the state it was computed for, and share
+        # results between states in the same 5 vehicle / 10 s bucket
+        controller = FuzzyTrafficController(stability_threshold=(5.0, 10.0),
+                                            cache_tolerance=(5.0, 10.0))
         print("✓ Fuzzy controller ready (28 rules per direction)")
     except Exception as e:
         print(f"ERROR initializing controller: {e}")
@@ -59,7 +64,8 @@ def run_fuzzy_sumo_demo(
             sumo_cfg=sumo_cfg,
             tls_id="center",
             use_gui=use_gui,
-            step_length=1.0
+            step_length=1.0,
+            backend=backend
         )
         simulator.start()
         print("✓ SUMO started successfully")
@@ -77,9 +83,13 @@ def run_fuzzy_sumo_demo(
         current_phase = 'north_south'
         phase_start_time = 0
 
+        # Traffic state buffers (north, south, east, west), reused every phase
+        traffic_state = TrafficStateArray(np.empty(4), np.empty(4))
+        densities, waiting_times = traffic_state
+
         while current_time < simulation_duration:
             # Get current traffic state
-            traffic_state = simulator.get_traffic_state()
+            simulator.get_traffic_state_into(densities, waiting_times)
 
             # Determine which direction to control based on current phase
             if current_phase == 'north_south':
@@ -88,13 +98,9 @@ def run_fuzzy_sumo_demo(
                 active_direction = 'east'
 
             # Get green time from fuzzy controller
-            densities = {d: traffic_state[d]['density'] for d in traffic_state}
-            waiting_times = {d: traffic_state[d]['waiting_time'] for d in traffic_state}
-
             green_duration = controller.compute_green_time(
-                direction=active_direction,
-                densities=densities,
-                waiting_times=waiting_times
+                active_direction,
+                traffic_state
             )
 
             # Apply decision to SUMO
@@ -104,8 +110,8 @@ def run_fuzzy_sumo_demo(
             if current_time % 10 == 0:
                 print(
                     f"{current_time:6d}  | {current_phase:8s} | "
-                    f"{densities['north']:9.0f} | {densities['south']:9.0f} | "
-                    f"{densities['east']:9.0f} | {densities['west']:9.0f} | "
+                    f"{densities[0]:9.0f} | {densities[1]:9.0f} | "
+                    f"{densities[2]:9.0f} | {densities[3]:9.0f} | "
                     f"{green_duration:7.1f}"
                 )
 
@@ -158,6 +164,14 @@ def run_fuzzy_sumo_demo(
 
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description="SUMO + Fuzzy Controller Demo")
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Run SUMO in-process via libsumo (headless, no GUI)"
+    )
+    args = parser.parse_args()
+
     # Determine paths
     script_dir = Path(__file__).parent
     project_root = script_dir.parent
@@ -174,13 +188,15 @@ def main():
     print(f"Using SUMO config: {sumo_cfg}")
     print("\nOptions:")
     print("  - Press Ctrl+C to stop simulation early")
-    print("  - Close SUMO window to end simulation")
+    if not args.fast:
+        print("  - Close SUMO window to end simulation")
     print()
 
     run_fuzzy_sumo_demo(
         sumo_cfg=str(sumo_cfg),
         simulation_duration=600,  # 10 minutes
-        use_gui=True  # Set to False for headless mode
+        use_gui=True,  # Set to False for headless mode
+        backend="libsumo" if args.fast else "traci"
     )
 
 
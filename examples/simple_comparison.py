@@ -5,6 +5,9 @@ Demonstrates how to run a simple comparison between Fuzzy and Fixed-Time control
 """
 
 import sys
+import math
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 
 # Add src to path
@@ -16,44 +19,20 @@ from simulation.fixed_controller import FixedTimeController
 from simulation.scenarios import Scenarios
 
 
-def run_simple_demo():
-    """Run a simple 2-minute demo comparison"""
-    print("=" * 70)
-    print("SIMPLE FUZZY VS FIXED-TIME CONTROLLER DEMO")
-    print("=" * 70)
-
-    # Use normal traffic scenario
-    scenario = Scenarios.normal_traffic()
-    duration = 120  # 2 minutes
-
-    print(f"\nScenario: {scenario.name}")
-    print(f"Duration: {duration}s")
-    print(f"Arrival rates: {scenario.arrival_rates}")
-
-    # Test Fuzzy Controller
-    print("\n" + "-" * 70)
-    print("Testing Fuzzy Controller...")
-    print("-" * 70)
-
+def _run_fuzzy(scenario, duration: int, seed: int) -> dict:
+    """Run the fuzzy controller simulation and return its statistics"""
     fuzzy_controller = FuzzyTrafficController(enable_logging=False)
     simulator = TrafficSimulator(
         arrival_rates=scenario.arrival_rates,
         simulation_duration=duration,
-        random_seed=42
+        random_seed=seed
     )
 
-    # Simple simulation loop
+    # Simple simulation loop: switch phases every 30 seconds (simplified)
     current_phase = 'ns'  # Start with North-South
-    phase_time = 0
-
-    for _ in range(int(duration)):
-        traffic_state = simulator.get_traffic_state()
-
-        # Switch phases every 30 seconds (simplified)
-        if phase_time >= 30:
-            current_phase = 'ew' if current_phase == 'ns' else 'ns'
-            phase_time = 0
+    elapsed = 0
 
+    while elapsed < int(duration):
         # Set lights based on current phase
         if current_phase == 'ns':
             simulator.set_all_lights({
@@ -70,43 +49,99 @@ def run_simple_demo():
                 'west': LightState.GREEN
             })
 
-        simulator.step(1.0)
-        phase_time += 1
+        # Lights are constant for the whole phase, so run it in one call
+        phase_steps = min(30, int(duration) - elapsed)
+        simulator.step(1.0, phase_steps)
+        elapsed += phase_steps
 
-    fuzzy_stats = simulator.get_statistics()
+        current_phase = 'ew' if current_phase == 'ns' else 'ns'
 
-    print(f"Results:")
-    print(f"  Total departures: {fuzzy_stats['total_departures']}")
-    print(f"  Avg waiting time: {fuzzy_stats['average_waiting_time']:.2f}s")
-    print(f"  Total queue: {fuzzy_stats['total_queue_length']} vehicles")
+    return simulator.get_statistics()
 
-    # Test Fixed-Time Controller
-    print("\n" + "-" * 70)
-    print("Testing Fixed-Time Controller...")
-    print("-" * 70)
 
+def _run_fixed(scenario, duration: int, seed: int) -> dict:
+    """Run the fixed-time controller simulation and return its statistics"""
     fixed_controller = FixedTimeController(ns_green=40, ew_green=40)
-    simulator2 = TrafficSimulator(
+    simulator = TrafficSimulator(
         arrival_rates=scenario.arrival_rates,
         simulation_duration=duration,
-        random_seed=42  # Same seed for fair comparison
+        random_seed=seed
     )
 
-    for _ in range(int(duration)):
+    elapsed = 0
+
+    while elapsed < int(duration):
         light_states = fixed_controller.get_light_states()
 
         for direction, state_str in light_states.items():
-            simulator2.set_light_state(direction, LightState(state_str))
+            simulator.set_light_state(direction, LightState(state_str))
+
+        # Run whole seconds up to the end of the current phase
+        phase = fixed_controller.get_current_phase()
+        remaining = phase.duration - fixed_controller.time_in_current_phase
+        phase_steps = min(max(int(math.ceil(remaining)), 1), int(duration) - elapsed)
+
+        simulator.step(1.0, phase_steps)
+        fixed_controller.step(float(phase_steps))
+        elapsed += phase_steps
 
-        simulator2.step(1.0)
-        fixed_controller.step(1.0)
+    return simulator.get_statistics()
 
-    fixed_stats = simulator2.get_statistics()
 
+def _run_both(scenario, duration: int, seed: int):
+    """
+    Run both simulations, in parallel processes when possible.
+
+    The runs are independent and each seeds its own simulator, so the
+    results are the same as running them one after the other.
+    """
+    try:
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            fuzzy_future = executor.submit(_run_fuzzy, scenario, duration, seed)
+            fixed_future = executor.submit(_run_fixed, scenario, duration, seed)
+            return fuzzy_future.result(), fixed_future.result()
+    except (OSError, NotImplementedError, BrokenProcessPool) as e:
+        print(f"Process pool unavailable ({e}), running sequentially")
+        return (_run_fuzzy(scenario, duration, seed),
+                _run_fixed(scenario, duration, seed))
+
+
+def _print_stats(stats: dict):
+    """Print the headline statistics of one run"""
     print(f"Results:")
-    print(f"  Total departures: {fixed_stats['total_departures']}")
-    print(f"  Avg waiting time: {fixed_stats['average_waiting_time']:.2f}s")
-    print(f"  Total queue: {fixed_stats['total_queue_length']} vehicles")
+    print(f"  Total departures: {stats['total_departures']}")
+    print(f"  Avg waiting time: {stats['average_waiting_time']:.2f}s")
+    print(f"  Total queue: {stats['total_queue_length']} vehicles")
+
+
+def run_simple_demo():
+    """Run a simple 2-minute demo comparison"""
+    print("=" * 70)
+    print("SIMPLE FUZZY VS FIXED-TIME CONTROLLER DEMO")
+    print("=" * 70)
+
+    # Use normal traffic scenario
+    scenario = Scenarios.normal_traffic()
+    duration = 120  # 2 minutes
+
+    print(f"\nScenario: {scenario.name}")
+    print(f"Duration: {duration}s")
+    print(f"Arrival rates: {scenario.arrival_rates}")
+
+    # Same seed for fair comparison
+    fuzzy_stats, fixed_stats = _run_both(scenario, duration, seed=42)
+
+    # Test Fuzzy Controller
+    print("\n" + "-" * 70)
+    print("Testing Fuzzy Controller...")
+    print("-" * 70)
+    _print_stats(fuzzy_stats)
+
+    # Test Fixed-Time Controller
+    print("\n" + "-" * 70)
+    print("Testing Fixed-Time Controller...")
+    print("-" * 70)
+    _print_stats(fixed_stats)
 
     # Comparison
     print("\n" + "=" * 70)
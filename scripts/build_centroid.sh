@@ -0,0 +1,25 @@
+#!/bin/bash
+# Build the optional C centroid extension used by FastMamdaniEngine
+# Produces src/fuzzy_controller/_centroid.so (loaded via ctypes)
+
+set -e
+
+echo "=================================================="
+echo "  Fuzzy Traffic System - Build C Centroid"
+echo "=================================================="
+echo
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+PROJECT_ROOT="$(dirname "$SCRIPT_DIR")"
+SRC_DIR="$PROJECT_ROOT/src/fuzzy_controller"
+CC="${CC:-cc}"
+
+# -march=native enables AVX2/FMA where the CPU supports it
+$CC -O3 -march=native -shared -fPIC \
+    -o "$SRC_DIR/_centroid.so" "$SRC_DIR/_centroid.c"
+
+echo "✓ Built $SRC_DIR/_centroid.so"
+echo
+echo "=================================================="
+echo "✅ Build complete!"
+echo "=================================================="
@@ -0,0 +1,58 @@
+"""
+Build the optional ahead-of-time compiled Mamdani kernel.
+
+Compiles ``fuzzy_controller.inference._mamdani_kernel`` with numba.pycc
+into ``src/fuzzy_controller/_mamdani_aot`` (a native extension module).
+FastMamdaniEngine loads it when present, so inference needs no JIT
+compilation at start-up and no Numba at run time.
+
+The kernel takes the rule base as table arguments, so one build serves
+any rule set of the supported table dtypes: float64 membership tables and
+the uint8 tables of ``compact_tables=True``.
+
+Usage:
+    python scripts/build_fuzzy_aot.py
+"""
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SRC_DIR = PROJECT_ROOT / 'src'
+sys.path.insert(0, str(SRC_DIR))
+
+from numba.pycc import CC
+
+from fuzzy_controller.inference import _mamdani_kernel
+
+# Argument types in _mamdani_kernel order; {mf} is the membership table dtype
+_SIGNATURE = ("void(f8[:], f8[:], f8[:], f8[:], intp[:], {mf}[:, :, :], b1, "
+              "intp[:, :, :, :, :], f8[:, :], f8[:, :, :], {mf}[:, :], f8, "
+              "f8[:], f8[:], intp, f8[:])")
+
+# Export name -> membership table dtype
+_EXPORTS = {
+    'mamdani': 'f8',
+    'mamdani_compact': 'u1',
+}
+
+
+def main():
+    print("=" * 50)
+    print("  Fuzzy Traffic System - Build AOT Mamdani Kernel")
+    print("=" * 50)
+
+    kernel = getattr(_mamdani_kernel, 'py_func', _mamdani_kernel)
+
+    cc = CC('_mamdani_aot')
+    cc.output_dir = str(SRC_DIR / 'fuzzy_controller')
+    cc.verbose = False
+    for name, mf_type in _EXPORTS.items():
+        cc.export(name, _SIGNATURE.format(mf=mf_type))(kernel)
+    cc.compile()
+
+    print(f"✓ Built {cc.output_file} in {cc.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
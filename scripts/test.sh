@@ -13,6 +13,12 @@ echo "🧪 Running system tests..."
 echo
 poetry run python test_system.py
 
+# Run component tests
+echo
+echo "🧪 Running component tests..."
+echo
+poetry run pytest -x
+
 echo
 echo "=================================================="
 echo "✅ All tests passed!"
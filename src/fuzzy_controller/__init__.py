@@ -2,10 +2,16 @@
 
 from .membership_functions import create_membership_functions
 from .fuzzy_rules import create_fuzzy_rules
-from .controller import FuzzyTrafficController
+from .controller import FuzzyTrafficController, Phase, TrafficStateArray
+from .inference import FastMamdaniEngine
+from .lookup_table import GreenTimeTable
 
 __all__ = [
     "create_membership_functions",
     "create_fuzzy_rules",
     "FuzzyTrafficController",
+    "TrafficStateArray",
+    "Phase",
+    "FastMamdaniEngine",
+    "GreenTimeTable",
 ]
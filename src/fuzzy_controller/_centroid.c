@@ -0,0 +1,48 @@
+/*
+ * Centroid of a sampled membership function.
+ *
+ * Computes (mu . num_w) / (mu . den_w) in a single pass, where num_w and
+ * den_w are the piecewise-linear quadrature weights precomputed by
+ * FastMamdaniEngine. Uses AVX2 FMA when compiled with -mavx2 -mfma
+ * (or -march=native on a capable CPU), scalar code otherwise.
+ *
+ * Build with scripts/build_centroid.sh; loaded through ctypes.
+ */
+
+#ifdef __AVX2__
+#include <immintrin.h>
+#endif
+
+double centroid(const double *mu, const double *num_w, const double *den_w, int n)
+{
+    double num = 0.0;
+    double den = 0.0;
+    int i = 0;
+
+#if defined(__AVX2__) && defined(__FMA__)
+    __m256d num_acc = _mm256_setzero_pd();
+    __m256d den_acc = _mm256_setzero_pd();
+
+    for (; i + 4 <= n; i += 4) {
+        __m256d m = _mm256_loadu_pd(mu + i);
+        num_acc = _mm256_fmadd_pd(m, _mm256_loadu_pd(num_w + i), num_acc);
+        den_acc = _mm256_fmadd_pd(m, _mm256_loadu_pd(den_w + i), den_acc);
+    }
+
+    double lanes[4];
+    _mm256_storeu_pd(lanes, num_acc);
+    num = lanes[0] + lanes[1] + lanes[2] + lanes[3];
+    _mm256_storeu_pd(lanes, den_acc);
+    den = lanes[0] + lanes[1] + lanes[2] + lanes[3];
+#endif
+
+    for (; i < n; i++) {
+        num += mu[i] * num_w[i];
+        den += mu[i] * den_w[i];
+    }
+
+    if (den <= 0.0) {
+        return 0.0 / 0.0;  /* NaN: empty membership */
+    }
+    return num / den;
+}
@@ -6,11 +6,86 @@ Main controller implementing Mamdani inference for traffic light control.
 
 import numpy as np
 from skfuzzy import control as ctrl
-from typing import Dict, Optional, List
+from typing import Dict, NamedTuple, Optional, List, Tuple, Union
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 import logging
 
 from .membership_functions import create_membership_functions
-from .fuzzy_rules import create_all_fuzzy_rules
+from .fuzzy_rules import (create_all_fuzzy_rules, create_template_rules,
+                          DIRECTION_ROLES, TEMPLATE_DIRECTION)
+from .inference import FastMamdaniEngine
+from .lookup_table import GreenTimeTable
+
+
+class TrafficStateArray(NamedTuple):
+    """
+    Traffic state as two fixed-order arrays (north, south, east, west).
+
+    Structure-of-arrays form of the nested traffic_state dict; any
+    (densities, waiting_times) pair of arrays is accepted the same way.
+    """
+    densities: np.ndarray
+    waiting_times: np.ndarray
+
+    @classmethod
+    def from_dict(cls, traffic_state: Dict[str, Dict[str, float]]) -> "TrafficStateArray":
+        """Build from the {'density': {...}, 'waiting_time': {...}} form."""
+        densities = traffic_state['density']
+        waiting_times = traffic_state['waiting_time']
+        return cls(
+            np.array([densities.get(d, 0) for d in ['north', 'south', 'east', 'west']],
+                     dtype=np.float64),
+            np.array([waiting_times.get(d, 0) for d in ['north', 'south', 'east', 'west']],
+                     dtype=np.float64),
+        )
+
+
+# Either the nested dict form {'density': {...}, 'waiting_time': {...}} or a
+# TrafficStateArray / (densities, waiting_times) pair
+TrafficState = Union[Dict[str, Dict[str, float]], TrafficStateArray,
+                     Tuple[np.ndarray, np.ndarray]]
+
+_DIRECTIONS = ('north', 'south', 'east', 'west')
+
+# Template system input labels: (current, opposite, perp1, perp2) roles
+_ROLES = (TEMPLATE_DIRECTION, *DIRECTION_ROLES[TEMPLATE_DIRECTION])
+_TEMPLATE_LABELS = tuple(
+    [f'density_{role}' for role in _ROLES] +
+    [f'waiting_{role}' for role in _ROLES]
+)
+
+# Input vector positions feeding each template label, per direction
+_ROLE_INDICES = {
+    direction: np.array(
+        [_DIRECTIONS.index(d) for d in (direction, *DIRECTION_ROLES[direction])] +
+        [4 + _DIRECTIONS.index(d) for d in (direction, *DIRECTION_ROLES[direction])]
+    )
+    for direction in _DIRECTIONS
+}
+
+
+@dataclass(slots=True)
+class Phase:
+    """One phase of a traffic light schedule"""
+    name: str
+    start_time: float
+    duration: float
+    north: str
+    south: str
+    east: str
+    west: str
+
+
+# Signal cycle templates; schedules fill in start_time and duration
+_SCHEDULE_PHASES = (
+    Phase('NS_GREEN', 0.0, 0.0, 'green', 'green', 'red', 'red'),
+    Phase('NS_YELLOW', 0.0, 0.0, 'yellow', 'yellow', 'red', 'red'),
+    Phase('ALL_RED_1', 0.0, 0.0, 'red', 'red', 'red', 'red'),
+    Phase('EW_GREEN', 0.0, 0.0, 'red', 'red', 'green', 'green'),
+    Phase('EW_YELLOW', 0.0, 0.0, 'red', 'red', 'yellow', 'yellow'),
+    Phase('ALL_RED_2', 0.0, 0.0, 'red', 'red', 'red', 'red'),
+)
 
 
 class FuzzyTrafficController:
@@ -21,39 +96,114 @@ class FuzzyTrafficController:
     to compute optimal green light duration for each direction.
     """
 
-    def __init__(self, enable_logging: bool = False):
+    def __init__(self,
+                 enable_logging: bool = False,
+                 cache_tolerance: Optional[Tuple[float, float]] = None,
+                 cache_size: int = 4096,
+                 fast_inference: bool = True,
+                 stability_threshold: Optional[Tuple[float, float]] = None,
+                 lookup_table: Optional[GreenTimeTable] = None,
+                 antecedents: Optional[Dict[str, ctrl.Antecedent]] = None,
+                 consequent: Optional[ctrl.Consequent] = None,
+                 all_rules: Optional[Dict[str, List[ctrl.Rule]]] = None):
         """
         Initialize the fuzzy traffic controller.
 
         Args:
             enable_logging: Enable detailed logging for debugging
+            cache_tolerance: (density, waiting time) bucket widths used to
+                quantize traffic states for result caching, e.g. (5.0, 10.0).
+                A bucket returns the green time of the first state computed
+                in it, so results depend on call order; wider buckets give
+                more cache hits at the cost of accuracy. None (default)
+                disables caching.
+            cache_size: Maximum number of cached green times (LRU eviction)
+            fast_inference: Use the vectorized NumPy inference engine instead
+                of skfuzzy's ControlSystemSimulation. Results agree to within
+                0.1 s (about 0.06 s at most over random states), but that can
+                still move a green time across a whole-second boundary.
+            stability_threshold: (density, waiting time) tolerances. While
+                every input stays within these of the state a direction was
+                last computed for, its previous green time is returned
+                without inference. None disables this hysteresis.
+            lookup_table: Precomputed GreenTimeTable; when given, green times
+                are read from the nearest grid point instead of running
+                inference (coarse approximation, see lookup_table module)
+            antecedents: Input variables from create_membership_functions,
+                to reuse instead of building new ones (requires consequent)
+            consequent: Output variable matching antecedents
+            all_rules: Rules from create_all_fuzzy_rules built on the given
+                antecedents and consequent, to reuse instead of rebuilding
         """
+        if (antecedents is None) != (consequent is None):
+            raise ValueError("antecedents and consequent must be given together")
+        if all_rules is not None and antecedents is None:
+            raise ValueError("all_rules requires the antecedents and consequent "
+                             "they were built on")
+
         self.logger = logging.getLogger(__name__)
         if enable_logging:
             logging.basicConfig(level=logging.INFO)
+        # Checked once so compute_green_time skips the debug call when unused
+        self._debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
 
         # Create membership functions
-        self.logger.info("Creating membership functions...")
-        self.antecedents, self.consequent = create_membership_functions()
+        if antecedents is None:
+            self.logger.info("Creating membership functions...")
+            antecedents, consequent = create_membership_functions()
+        self.antecedents, self.consequent = antecedents, consequent
 
         # Create fuzzy rules for all directions
-        self.logger.info("Creating fuzzy rules...")
-        self.all_rules = create_all_fuzzy_rules(self.antecedents, self.consequent)
-
-        # Create control systems for each direction
-        self.logger.info("Building control systems...")
-        self.control_systems = {}
-        self.controllers = {}
-
-        for direction in ['north', 'south', 'east', 'west']:
-            # Create control system with rules for this direction
-            self.control_systems[direction] = ctrl.ControlSystem(
-                self.all_rules[direction]
-            )
-            # Create simulation controller
-            self.controllers[direction] = ctrl.ControlSystemSimulation(
-                self.control_systems[direction]
-            )
+        if all_rules is None:
+            self.logger.info("Creating fuzzy rules...")
+            all_rules = create_all_fuzzy_rules(self.antecedents, self.consequent)
+        self.all_rules = all_rules
+
+        # The skfuzzy path runs one direction-independent template system
+        # with inputs remapped per direction. It is built on first use (see
+        # _get_controller); the vectorized engine does not need it.
+        self.control_system: Optional[ctrl.ControlSystem] = None
+        self.controller: Optional[ctrl.ControlSystemSimulation] = None
+
+        # Last input values written to the simulation and the output they
+        # produced, used to skip redundant assignments and computes on the
+        # skfuzzy path
+        self._last_inputs: Dict[str, float] = {}
+        self._last_output: Optional[float] = None
+
+        # Vectorized Mamdani engine; rule set index = direction index
+        self.engine: Optional[FastMamdaniEngine] = None
+        if fast_inference:
+            self.logger.info("Building vectorized inference engine...")
+            self.engine = FastMamdaniEngine(self.antecedents, self.consequent,
+                                            self.all_rules)
+        self._direction_index = {d: i for i, d in enumerate(self.all_rules)}
+
+        # Everything compute_green_time needs per direction, resolved once:
+        # (rule set / input index, template input positions)
+        self._direction_bindings = {
+            d: (i, _ROLE_INDICES[d]) for d, i in self._direction_index.items()
+        }
+
+        if lookup_table is not None and lookup_table.rule_set_names != list(self.all_rules):
+            raise ValueError(f"Lookup table directions {lookup_table.rule_set_names} "
+                             f"do not match {list(self.all_rules)}")
+        self.lookup_table = lookup_table
+
+        # LRU cache of green times keyed on quantized traffic state.
+        # Traffic changes slowly, so nearby states reuse one inference.
+        self.cache_tolerance = cache_tolerance
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[tuple, float]" = OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._input_upper = np.array([100.0] * 4 + [300.0] * 4)
+        self._schedule_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+        # Last computed input vector and green time per direction
+        self.stability_threshold = stability_threshold
+        self._last_state: Dict[str, np.ndarray] = {}
+        self._last_green: Dict[str, float] = {}
 
         self.logger.info("✓ Fuzzy Traffic Controller initialized successfully!")
         self.logger.info(f"  - Directions: 4 (N, S, E, W)")
@@ -62,7 +212,7 @@ class FuzzyTrafficController:
 
     def compute_green_time(self,
                           direction: str,
-                          traffic_state: Dict[str, Dict[str, float]]) -> float:
+                          traffic_state: TrafficState) -> float:
         """
         Compute optimal green light duration for a specific direction.
 
@@ -71,6 +221,7 @@ class FuzzyTrafficController:
             traffic_state: Dictionary containing:
                 - 'density': {direction: vehicle_count} for all 4 directions
                 - 'waiting_time': {direction: seconds} for all 4 directions
+                or a TrafficStateArray
 
         Returns:
             Optimal green light duration in seconds
@@ -82,154 +233,279 @@ class FuzzyTrafficController:
             ... }
             >>> green_time = controller.compute_green_time('north', traffic_state)
         """
-        if direction not in self.controllers:
+        bindings = self._direction_bindings.get(direction)
+        if bindings is None:
             raise ValueError(f"Invalid direction: {direction}. "
                            f"Must be one of: north, south, east, west")
 
-        controller = self.controllers[direction]
-
-        # Set inputs for all directions
-        for dir_name in ['north', 'south', 'east', 'west']:
-            # Set density
-            density_value = traffic_state['density'].get(dir_name, 0)
-            controller.input[f'density_{dir_name}'] = np.clip(density_value, 0, 100)
-
-            # Set waiting time
-            waiting_value = traffic_state['waiting_time'].get(dir_name, 0)
-            controller.input[f'waiting_{dir_name}'] = np.clip(waiting_value, 0, 300)
+        index, role_indices = bindings
+        state = self._input_vector(traffic_state)
+
+        if self.stability_threshold is not None:
+            if self._is_stable(direction, state):
+                return self._last_green[direction]
+
+        cache_key = None
+        if self.cache_tolerance is not None:
+            cache_key = self._cache_key(direction, state)
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._cache.move_to_end(cache_key)
+                self._cache_hits += 1
+                self._remember(direction, state, cached)
+                return cached
+
+        if self.lookup_table is None and self.engine is None:
+            controller = self._get_controller()
+            last_inputs = self._last_inputs
+
+            # Set inputs in role order, clipped in one pass. Each assignment
+            # scans the control graph and rehashes the input set, so
+            # unchanged inputs are skipped.
+            values = np.clip(state, 0, self._input_upper)[role_indices].tolist()
+            changed = False
+            for label, value in zip(_TEMPLATE_LABELS, values):
+                if last_inputs.get(label) != value:
+                    controller.input[label] = value
+                    last_inputs[label] = value
+                    changed = True
 
         # Compute output using Mamdani inference
         try:
-            controller.compute()
-            green_time = controller.output['green_time']
-
-            self.logger.debug(f"{direction.upper()} - Green time: {green_time:.1f}s "
-                            f"(density: {traffic_state['density'][direction]}, "
-                            f"waiting: {traffic_state['waiting_time'][direction]:.1f}s)")
+            if self.lookup_table is not None:
+                green_time = float(self.lookup_table.lookup(state)[index])
+            elif self.engine is not None:
+                green_time = self.engine.compute(state, index)
+            else:
+                # Identical inputs give the previous output without
+                # re-entering skfuzzy's compute and its run cache
+                if changed:
+                    controller.compute()
+                    self._last_output = controller.output['green_time']
+                    # skfuzzy flushes its per-simulation state, inputs
+                    # included, every flush_after_run computes and restarts
+                    # its run count; the remembered inputs are stale then
+                    if controller._run == 0:
+                        last_inputs.clear()
+                green_time = self._last_output
+
+            if self._debug_enabled:
+                self.logger.debug("%s - Green time: %.1fs (density: %g, waiting: %.1fs)",
+                                  direction.upper(), green_time,
+                                  state[index], state[4 + index])
+
+            if cache_key is not None:
+                self._cache_store(cache_key, green_time)
+            self._remember(direction, state, green_time)
 
             return green_time
 
         except Exception as e:
-            self.logger.error(f"Error computing green time for {direction}: {e}")
+            self.logger.error("Error computing green time for %s: %s", direction, e)
+            # Force the next skfuzzy call to reassign inputs and recompute
+            self._last_inputs.clear()
             # Return default medium green time on error
             return 40.0
 
+    def _get_controller(self) -> ctrl.ControlSystemSimulation:
+        """Build (once) and return the skfuzzy template simulation."""
+        if self.controller is not None:
+            return self.controller
+
+        self.logger.info("Building template control system...")
+        _, template_rules = create_template_rules(self.antecedents, self.consequent)
+        self.control_system = ctrl.ControlSystem(template_rules)
+        controller = ctrl.ControlSystemSimulation(self.control_system)
+
+        # Prime skfuzzy's per-simulation state with a midrange input
+        for label, value in zip(_TEMPLATE_LABELS, [50.0] * 4 + [150.0] * 4):
+            controller.input[label] = value
+            self._last_inputs[label] = value
+        controller.compute()
+        self._last_output = controller.output['green_time']
+
+        self.controller = controller
+        return controller
+
+    def _input_vector(self, traffic_state: TrafficState) -> np.ndarray:
+        """Pack a traffic state into the engine's input order."""
+        if isinstance(traffic_state, dict):
+            traffic_state = TrafficStateArray.from_dict(traffic_state)
+
+        densities, waiting_times = traffic_state
+        return np.concatenate((densities, waiting_times)).astype(np.float64, copy=False)
+
+    def _cache_key(self, direction: str, state: np.ndarray) -> tuple:
+        """Build the quantized cache key for a direction and input vector."""
+        density_step, waiting_step = self.cache_tolerance
+        buckets = np.rint(np.clip(state, 0, self._input_upper) /
+                          (density_step, density_step, density_step, density_step,
+                           waiting_step, waiting_step, waiting_step, waiting_step))
+        return (direction, *buckets.astype(np.int64).tolist())
+
+    def _cache_store(self, cache_key: tuple, green_time: float):
+        """Insert a green time into the LRU cache, evicting the oldest entry."""
+        self._cache_misses += 1
+        self._cache[cache_key] = green_time
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _is_stable(self, direction: str, state: np.ndarray) -> bool:
+        """Check whether a state is within the stability threshold of the last one."""
+        last_state = self._last_state.get(direction)
+        if last_state is None:
+            return False
+
+        density_tol, waiting_tol = self.stability_threshold
+        delta = np.abs(state - last_state)
+        return bool(delta[:4].max() <= density_tol and delta[4:].max() <= waiting_tol)
+
+    def _remember(self, direction: str, state: np.ndarray, green_time: float):
+        """Record the state a green time was computed for (hysteresis anchor)."""
+        if self.stability_threshold is not None:
+            self._last_state[direction] = state
+            self._last_green[direction] = green_time
+
+    def cache_info(self) -> Dict[str, int]:
+        """Green time cache statistics, in the spirit of functools.lru_cache."""
+        return {
+            'hits': self._cache_hits,
+            'misses': self._cache_misses,
+            'size': len(self._cache),
+            'max_size': self.cache_size,
+        }
+
+    def clear_cache(self):
+        """Discard all cached green times, schedules and hysteresis state."""
+        self._cache.clear()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._schedule_cache.clear()
+        self._last_state.clear()
+        self._last_green.clear()
+
     def compute_all_green_times(self,
-                               traffic_state: Dict[str, Dict[str, float]]) -> Dict[str, float]:
+                               traffic_state: TrafficState) -> Dict[str, float]:
         """
         Compute green times for all four directions.
 
         Args:
-            traffic_state: Dictionary containing density and waiting_time for all directions
+            traffic_state: Dictionary containing density and waiting_time for all
+                directions, or a TrafficStateArray
 
         Returns:
             Dictionary mapping each direction to its optimal green time
         """
+        if self.lookup_table is None and self.engine is None:
+            green_times = {}
+
+            for direction in ['north', 'south', 'east', 'west']:
+                green_times[direction] = self.compute_green_time(direction, traffic_state)
+
+            return green_times
+
+        # Reuse stable and cached directions; a miss in any direction
+        # triggers one batched inference that covers all four.
+        cached = {}
+        state = self._input_vector(traffic_state)
+        if self.stability_threshold is not None:
+            for direction in ['north', 'south', 'east', 'west']:
+                if self._is_stable(direction, state):
+                    cached[direction] = self._last_green[direction]
+
+        cache_keys = {}
+        if self.cache_tolerance is not None:
+            for direction in ['north', 'south', 'east', 'west']:
+                if direction in cached:
+                    continue
+                cache_keys[direction] = self._cache_key(direction, state)
+                hit = self._cache.get(cache_keys[direction])
+                if hit is not None:
+                    self._cache.move_to_end(cache_keys[direction])
+                    self._cache_hits += 1
+                    self._remember(direction, state, hit)
+                    cached[direction] = hit
+
+        if len(cached) == 4:
+            return {direction: cached[direction]
+                    for direction in ['north', 'south', 'east', 'west']}
+
+        try:
+            if self.lookup_table is not None:
+                values = self.lookup_table.lookup(state)
+            else:
+                values = self.engine.compute_all(state)
+        except Exception as e:
+            self.logger.error("Error computing green times: %s", e)
+            return {direction: 40.0 for direction in ['north', 'south', 'east', 'west']}
+
         green_times = {}
+        for direction, green_time in zip(self._direction_index, values.tolist()):
+            if direction in cached:
+                green_times[direction] = cached[direction]
+                continue
 
-        for direction in ['north', 'south', 'east', 'west']:
-            green_times[direction] = self.compute_green_time(direction, traffic_state)
+            green_times[direction] = green_time
+            if direction in cache_keys:
+                self._cache_store(cache_keys[direction], green_time)
+            self._remember(direction, state, green_time)
 
         return green_times
 
     def get_traffic_light_schedule(self,
-                                   traffic_state: Dict[str, Dict[str, float]],
+                                   traffic_state: TrafficState,
                                    yellow_time: float = 3.0,
-                                   all_red_time: float = 2.0) -> List[Dict]:
+                                   all_red_time: float = 2.0) -> List[Phase]:
         """
         Generate complete traffic light schedule for a full cycle.
 
+        Schedules are cached on the quantized traffic state (see
+        ``cache_tolerance``), so repeated queries for a similar state skip
+        inference entirely. Each call returns fresh Phase objects.
+
         Args:
             traffic_state: Current traffic state
             yellow_time: Duration of yellow light (seconds)
             all_red_time: Duration when all lights are red (seconds)
 
         Returns:
-            List of phase dictionaries with timing and active directions
+            List of Phase objects with timing and per-direction light states
         """
+        # The hysteresis makes green times depend on call history, so
+        # schedules are only cached on the stateless path
+        schedule_key = None
+        if self.cache_tolerance is not None and self.stability_threshold is None:
+            state = self._input_vector(traffic_state)
+            schedule_key = (*self._cache_key('schedule', state), yellow_time, all_red_time)
+            cached = self._schedule_cache.get(schedule_key)
+            if cached is not None:
+                self._schedule_cache.move_to_end(schedule_key)
+                return [replace(phase) for phase in cached]
+
         # Compute green times for all directions
         green_times = self.compute_all_green_times(traffic_state)
 
+        # Phase durations, in _SCHEDULE_PHASES order
+        ns_green = (green_times['north'] + green_times['south']) / 2
+        ew_green = (green_times['east'] + green_times['west']) / 2
+        durations = (ns_green, yellow_time, all_red_time,
+                     ew_green, yellow_time, all_red_time)
+
         schedule = []
         current_time = 0
 
-        # Phase 1: North-South green
-        ns_green = (green_times['north'] + green_times['south']) / 2
-        schedule.append({
-            'phase': 'NS_GREEN',
-            'start_time': current_time,
-            'duration': ns_green,
-            'north': 'green',
-            'south': 'green',
-            'east': 'red',
-            'west': 'red'
-        })
-        current_time += ns_green
-
-        # Yellow transition
-        schedule.append({
-            'phase': 'NS_YELLOW',
-            'start_time': current_time,
-            'duration': yellow_time,
-            'north': 'yellow',
-            'south': 'yellow',
-            'east': 'red',
-            'west': 'red'
-        })
-        current_time += yellow_time
-
-        # All red
-        schedule.append({
-            'phase': 'ALL_RED_1',
-            'start_time': current_time,
-            'duration': all_red_time,
-            'north': 'red',
-            'south': 'red',
-            'east': 'red',
-            'west': 'red'
-        })
-        current_time += all_red_time
-
-        # Phase 2: East-West green
-        ew_green = (green_times['east'] + green_times['west']) / 2
-        schedule.append({
-            'phase': 'EW_GREEN',
-            'start_time': current_time,
-            'duration': ew_green,
-            'north': 'red',
-            'south': 'red',
-            'east': 'green',
-            'west': 'green'
-        })
-        current_time += ew_green
-
-        # Yellow transition
-        schedule.append({
-            'phase': 'EW_YELLOW',
-            'start_time': current_time,
-            'duration': yellow_time,
-            'north': 'red',
-            'south': 'red',
-            'east': 'yellow',
-            'west': 'yellow'
-        })
-        current_time += yellow_time
-
-        # All red
-        schedule.append({
-            'phase': 'ALL_RED_2',
-            'start_time': current_time,
-            'duration': all_red_time,
-            'north': 'red',
-            'south': 'red',
-            'east': 'red',
-            'west': 'red'
-        })
-        current_time += all_red_time
+        for template, duration in zip(_SCHEDULE_PHASES, durations):
+            schedule.append(replace(template, start_time=current_time, duration=duration))
+            current_time += duration
+
+        if schedule_key is not None:
+            self._schedule_cache[schedule_key] = tuple(replace(phase) for phase in schedule)
+            if len(self._schedule_cache) > self.cache_size:
+                self._schedule_cache.popitem(last=False)
 
         return schedule
 
-    def get_cycle_duration(self, traffic_state: Dict[str, Dict[str, float]]) -> float:
+    def get_cycle_duration(self, traffic_state: TrafficState) -> float:
         """
         Calculate total cycle duration based on current traffic state.
 
@@ -240,7 +516,7 @@ class FuzzyTrafficController:
             Total cycle duration in seconds
         """
         schedule = self.get_traffic_light_schedule(traffic_state)
-        return sum(phase['duration'] for phase in schedule)
+        return sum(phase.duration for phase in schedule)
 
 
 if __name__ == "__main__":
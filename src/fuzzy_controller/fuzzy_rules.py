@@ -8,7 +8,29 @@ Implements 28 fuzzy rules covering:
 """
 
 from skfuzzy import control as ctrl
-from typing import Dict, List
+from typing import Dict, List, Tuple
+
+
+# Direction name used by the direction-independent template rule set
+TEMPLATE_DIRECTION = 'current'
+
+# (opposite, perpendicular 1, perpendicular 2) for each direction. The rules
+# only depend on these roles, so every direction is the same template with
+# its inputs remapped.
+DIRECTION_ROLES = {
+    'north': ('south', 'east', 'west'),
+    'south': ('north', 'east', 'west'),
+    'east': ('west', 'north', 'south'),
+    'west': ('east', 'north', 'south'),
+    TEMPLATE_DIRECTION: ('opposite', 'perp1', 'perp2'),
+}
+
+# Positions of each rule category in the list built by create_fuzzy_rules
+RULE_CATEGORIES = {
+    'primary': slice(0, 12),    # R1-R12
+    'waiting': slice(12, 20),   # R13-R20
+    'fairness': slice(20, 28),  # R21-R28
+}
 
 
 def create_fuzzy_rules(antecedents: Dict[str, ctrl.Antecedent],
@@ -20,7 +42,9 @@ def create_fuzzy_rules(antecedents: Dict[str, ctrl.Antecedent],
     Args:
         antecedents: Dictionary of input variables
         consequent: Output variable (green_time)
-        direction: Traffic direction ('north', 'south', 'east', 'west')
+        direction: Traffic direction ('north', 'south', 'east', 'west'), or
+            TEMPLATE_DIRECTION for the role-based antecedents built by
+            create_template_rules
 
     Returns:
         List of fuzzy rules for the specified direction
@@ -30,23 +54,11 @@ def create_fuzzy_rules(antecedents: Dict[str, ctrl.Antecedent],
     current_density = antecedents[f'density_{direction}']
     current_waiting = antecedents[f'waiting_{direction}']
 
-    # Get opposite direction (for N-S or E-W axis)
-    opposite_map = {
-        'north': 'south',
-        'south': 'north',
-        'east': 'west',
-        'west': 'east'
-    }
-    opposite_dir = opposite_map[direction]
+    # Get opposite direction (for N-S or E-W axis) and perpendicular directions
+    opposite_dir, perp_dir1, perp_dir2 = DIRECTION_ROLES[direction]
     opposite_density = antecedents[f'density_{opposite_dir}']
     opposite_waiting = antecedents[f'waiting_{opposite_dir}']
 
-    # Get perpendicular directions
-    if direction in ['north', 'south']:
-        perp_dir1, perp_dir2 = 'east', 'west'
-    else:
-        perp_dir1, perp_dir2 = 'north', 'south'
-
     perp_density1 = antecedents[f'density_{perp_dir1}']
     perp_density2 = antecedents[f'density_{perp_dir2}']
     perp_waiting1 = antecedents[f'waiting_{perp_dir1}']
@@ -309,6 +321,41 @@ def create_all_fuzzy_rules(antecedents: Dict[str, ctrl.Antecedent],
     return all_rules
 
 
+def create_template_rules(antecedents: Dict[str, ctrl.Antecedent],
+                          consequent: ctrl.Consequent
+                          ) -> Tuple[Dict[str, ctrl.Antecedent], List[ctrl.Rule]]:
+    """
+    Create one direction-independent rule set over role-based inputs.
+
+    The rules of every direction are identical up to which inputs play the
+    current, opposite and perpendicular roles, so a single 28-rule system
+    fed with remapped inputs (see DIRECTION_ROLES) replaces the four
+    per-direction systems.
+
+    Args:
+        antecedents: Dictionary of directional input variables; the north
+            variables supply the shared universes and terms
+        consequent: Output variable (green_time)
+
+    Returns:
+        Tuple containing:
+        - Dictionary of role-based antecedents ('density_current', ...,
+          'waiting_perp2')
+        - List of template rules
+    """
+    template_antecedents = {}
+    for kind in ['density', 'waiting']:
+        source = antecedents[f'{kind}_north']
+        for role in (TEMPLATE_DIRECTION, *DIRECTION_ROLES[TEMPLATE_DIRECTION]):
+            variable = ctrl.Antecedent(source.universe, f'{kind}_{role}')
+            for term in source.terms:
+                variable[term] = source[term].mf
+            template_antecedents[f'{kind}_{role}'] = variable
+
+    rules = create_fuzzy_rules(template_antecedents, consequent, TEMPLATE_DIRECTION)
+    return template_antecedents, rules
+
+
 def print_rules_summary(all_rules: Dict[str, List[ctrl.Rule]]):
     """Print a summary of all created rules."""
     print("=" * 70)
@@ -319,11 +366,10 @@ def print_rules_summary(all_rules: Dict[str, List[ctrl.Rule]]):
         print(f"\n{direction.upper()} Direction: {len(rules)} rules")
         print("-" * 70)
 
-        # Group by category
-        primary = [r for r in rules if r.label.startswith(f'R{1}') or
-                   int(r.label.split('_')[0][1:]) <= 12]
-        waiting = [r for r in rules if 13 <= int(r.label.split('_')[0][1:]) <= 20]
-        fairness = [r for r in rules if int(r.label.split('_')[0][1:]) >= 21]
+        # Rules are built in category order, so each category is a slice
+        primary = rules[RULE_CATEGORIES['primary']]
+        waiting = rules[RULE_CATEGORIES['waiting']]
+        fairness = rules[RULE_CATEGORIES['fairness']]
 
         print(f"  Primary Density Rules:    {len(primary)}")
         print(f"  Waiting Time Rules:       {len(waiting)}")
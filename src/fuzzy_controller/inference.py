@@ -0,0 +1,534 @@
+"""
+Vectorized Mamdani Inference Engine
+
+NumPy implementation of the Mamdani pipeline used by the skfuzzy control
+system: fuzzification, min/max rule evaluation, max aggregation and
+centroid defuzzification. Membership functions are sampled once and the
+rule base is flattened into index tables, so an inference is a handful of
+array operations instead of a walk over the skfuzzy rule graph.
+"""
+
+import ctypes
+import os
+
+import numpy as np
+from skfuzzy import control as ctrl
+from skfuzzy.control.antecedent_consequent import accumulation_max
+from skfuzzy.control.term import Term, TermAggregate
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _load_centroid_extension():
+    """
+    Load the optional C centroid (built by scripts/build_centroid.sh).
+
+    Returns:
+        ctypes function ``centroid(mu, num_w, den_w, n)``, or None when the
+        shared library has not been built
+    """
+    path = os.path.join(os.path.dirname(__file__), '_centroid.so')
+    try:
+        lib = ctypes.CDLL(path)
+    except OSError:
+        return None
+
+    # Raw pointers: callers pass C-contiguous float64 buffers
+    lib.centroid.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p,
+                             ctypes.c_int]
+    lib.centroid.restype = ctypes.c_double
+    return lib.centroid
+
+
+_c_centroid = _load_centroid_extension()
+
+
+def _to_clauses(antecedent) -> List[List[Term]]:
+    """
+    Flatten a rule antecedent into conjunctive normal form.
+
+    Returns:
+        List of clauses combined with AND; each clause is a list of
+        terms combined with OR.
+    """
+    if isinstance(antecedent, Term):
+        return [[antecedent]]
+
+    if isinstance(antecedent, TermAggregate):
+        if antecedent.kind == 'and':
+            return _to_clauses(antecedent.term1) + _to_clauses(antecedent.term2)
+        if antecedent.kind == 'or':
+            return [left + right
+                    for left in _to_clauses(antecedent.term1)
+                    for right in _to_clauses(antecedent.term2)]
+
+    raise ValueError(f"Unsupported rule antecedent: {antecedent}")
+
+
+def _centroid_weights(universe: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Precompute weights for the piecewise-linear centroid on a universe.
+
+    The membership function is treated as linear between samples (as in
+    skfuzzy's centroid), so the moment and area integrals are linear in
+    the sampled memberships: centroid = (mu @ num) / (mu @ den).
+    """
+    x1, x2 = universe[:-1], universe[1:]
+    dx = x2 - x1
+
+    num = np.zeros_like(universe)
+    num[:-1] += dx * (2 * x1 + x2) / 6
+    num[1:] += dx * (x1 + 2 * x2) / 6
+
+    den = np.zeros_like(universe)
+    den[:-1] += dx / 2
+    den[1:] += dx / 2
+
+    return num, den
+
+
+def _mamdani_kernel(inputs, lower, upper, step, last_index, input_mfs,
+                    interpolate, literals, rule_weights, rule_outputs,
+                    output_mfs, mf_scale, centroid_num, centroid_den, rule_set, out):
+    """
+    Loop form of the Mamdani pipeline for every rule set.
+
+    Same arithmetic as ``FastMamdaniEngine.fuzzify``/``rule_strengths``/
+    ``defuzzify``, written as explicit loops so Numba can compile it.
+    Writes one centroid per rule set into ``out``, or only
+    ``out[rule_set]`` when ``rule_set`` is non-negative; an empty aggregate
+    yields NaN. Membership tables may be stored as integers, in which case
+    ``mf_scale`` maps them back to [0, 1].
+    """
+    n_inputs, _, n_terms = input_mfs.shape
+    n_sets, n_rules, n_clauses, n_literals, _ = literals.shape
+    n_out_terms, n_points = output_mfs.shape
+
+    memberships = np.empty((n_inputs, n_terms))
+    for i in range(n_inputs):
+        x = min(max(inputs[i], lower[i]), upper[i])
+        position = (x - lower[i]) / step[i]
+        if not interpolate:
+            nearest = int(np.rint(position))
+            for j in range(n_terms):
+                memberships[i, j] = input_mfs[i, nearest, j] * mf_scale
+            continue
+
+        lo = min(int(position), last_index[i])
+        frac = position - lo
+        for j in range(n_terms):
+            memberships[i, j] = (input_mfs[i, lo, j] * (1.0 - frac) +
+                                 input_mfs[i, lo + 1, j] * frac) * mf_scale
+
+    first_set, end_set = 0, n_sets
+    if rule_set >= 0:
+        first_set, end_set = rule_set, rule_set + 1
+
+    activation = np.empty(n_out_terms)
+    for s in range(first_set, end_set):
+        activation[:] = 0.0
+        for r in range(n_rules):
+            strength = 1.0
+            for c in range(n_clauses):
+                clause = 0.0
+                for k in range(n_literals):
+                    mu = memberships[literals[s, r, c, k, 0], literals[s, r, c, k, 1]]
+                    if mu > clause:
+                        clause = mu
+                if clause < strength:
+                    strength = clause
+            strength *= rule_weights[s, r]
+            for t in range(n_out_terms):
+                value = strength * rule_outputs[s, r, t]
+                if value > activation[t]:
+                    activation[t] = value
+
+        moment = 0.0
+        area = 0.0
+        for p in range(n_points):
+            mu = 0.0
+            for t in range(n_out_terms):
+                clipped = min(activation[t], output_mfs[t, p] * mf_scale)
+                if clipped > mu:
+                    mu = clipped
+            moment += mu * centroid_num[p]
+            area += mu * centroid_den[p]
+
+        out[s] = moment / area if area > 0 else np.nan
+
+
+if NUMBA_AVAILABLE:
+    _mamdani_kernel = njit(cache=True, fastmath=True)(_mamdani_kernel)
+
+
+def _load_aot_kernels():
+    """
+    Load the optional ahead-of-time compiled kernel module (built by
+    scripts/build_fuzzy_aot.py).
+
+    Returns:
+        Module exporting ``mamdani`` (float64 tables) and
+        ``mamdani_compact`` (uint8 tables), or None when it has not been built
+    """
+    try:
+        from . import _mamdani_aot
+    except ImportError:
+        return None
+    return _mamdani_aot
+
+
+_aot_kernels = _load_aot_kernels()
+
+
+class FastMamdaniEngine:
+    """
+    Mamdani inference engine over a fixed rule base.
+
+    Evaluates the same rules as ``ctrl.ControlSystemSimulation`` (fmin AND,
+    fmax OR, min implication, max accumulation, centroid defuzzification)
+    using precomputed NumPy tables. Each rule set (e.g. one per traffic
+    direction) is addressed by its index.
+
+    When Numba is installed or the AOT kernel has been built, ``compute``
+    and ``compute_all`` run a compiled loop kernel; otherwise they fall back
+    to the NumPy implementation.
+    """
+
+    def __init__(self,
+                 antecedents: Dict[str, ctrl.Antecedent],
+                 consequent: ctrl.Consequent,
+                 rule_sets: Dict[str, List[ctrl.Rule]],
+                 use_numba: bool = True,
+                 interpolate: bool = True,
+                 compact_tables: bool = False):
+        """
+        Build the inference tables.
+
+        Args:
+            antecedents: Dictionary of input variables; its order defines
+                the order of the input vector
+            consequent: Output variable
+            rule_sets: Mapping of rule set name to its list of rules
+            use_numba: Use the compiled kernel when the AOT module is built
+                or Numba is available
+            interpolate: Interpolate memberships between universe samples.
+                When False, inputs snap to the nearest sample and fuzzification
+                is a pure table lookup (error bounded by half a universe step).
+            compact_tables: Store membership tables as uint8 (scale 1/255)
+                instead of float64, an 8x smaller working set for the kernel
+        """
+        if consequent.defuzzify_method != 'centroid':
+            raise ValueError("FastMamdaniEngine only supports centroid "
+                             "defuzzification")
+        if consequent.accumulation_method not in (accumulation_max, np.fmax):
+            raise ValueError("FastMamdaniEngine only supports fmax accumulation")
+
+        self.input_labels = list(antecedents.keys())
+        self.interpolate = interpolate
+        self.rule_set_names = list(rule_sets.keys())
+
+        # Sample input membership functions on a common padded grid:
+        # input_mfs[input, point, term]
+        variables = list(antecedents.values())
+        n_inputs = len(variables)
+        max_points = max(len(var.universe) for var in variables)
+        max_terms = max(len(var.terms) for var in variables)
+
+        self.input_mfs = np.zeros((n_inputs, max_points, max_terms))
+        self._lower = np.empty(n_inputs)
+        self._upper = np.empty(n_inputs)
+        self._step = np.empty(n_inputs)
+        self._last_index = np.empty(n_inputs, dtype=np.intp)
+
+        term_index = {}
+        for i, var in enumerate(variables):
+            universe = np.asarray(var.universe, dtype=np.float64)
+            steps = np.diff(universe)
+            if not np.allclose(steps, steps[0]):
+                raise ValueError(f"Universe of '{var.label}' must be uniformly spaced")
+
+            self._lower[i] = universe[0]
+            self._upper[i] = universe[-1]
+            self._step[i] = steps[0]
+            self._last_index[i] = len(universe) - 2
+
+            for j, (label, term) in enumerate(var.terms.items()):
+                self.input_mfs[i, :len(universe), j] = term.mf
+                term_index[(var.label, label)] = (i, j)
+
+        self._input_rows = np.arange(n_inputs)
+
+        # Sample output membership functions: output_mfs[term, point]
+        self.output_universe = np.asarray(consequent.universe, dtype=np.float64)
+        output_terms = list(consequent.terms.keys())
+        self.output_mfs = np.array([consequent[t].mf for t in output_terms],
+                                   dtype=np.float64)
+        self._centroid_num, self._centroid_den = _centroid_weights(self.output_universe)
+
+        # Memberships lie in [0, 1], so 8 bits keep them within 1/510
+        self._mf_scale = 1.0
+        if compact_tables:
+            self._mf_scale = 1.0 / 255
+            self.input_mfs = np.rint(self.input_mfs * 255).astype(np.uint8)
+            self.output_mfs = np.rint(self.output_mfs * 255).astype(np.uint8)
+
+        # Flatten rules into literal tables:
+        # literals[set, rule, clause, literal] = (input index, term index)
+        flattened = []
+        for rules in rule_sets.values():
+            set_rules = []
+            for rule in rules:
+                if rule.and_func is not np.fmin or rule.or_func is not np.fmax:
+                    raise ValueError(f"Rule {rule.label}: only fmin/fmax "
+                                     f"aggregation is supported")
+                if len(rule.consequent) != 1:
+                    raise ValueError(f"Rule {rule.label}: exactly one "
+                                     f"consequent term is required")
+
+                clauses = [[term_index[(t.parent.label, t.label)] for t in clause]
+                           for clause in _to_clauses(rule.antecedent)]
+                weighted = rule.consequent[0]
+                set_rules.append((clauses,
+                                  output_terms.index(weighted.term.label),
+                                  weighted.weight))
+            flattened.append(set_rules)
+
+        n_sets = len(flattened)
+        n_rules = max(len(set_rules) for set_rules in flattened)
+        n_clauses = max(len(clauses) for set_rules in flattened
+                        for clauses, _, _ in set_rules)
+        n_literals = max(len(clause) for set_rules in flattened
+                         for clauses, _, _ in set_rules for clause in clauses)
+
+        # Padding repeats an existing literal/clause, which leaves max/min
+        # unchanged; padded rules get zero weight so they never fire.
+        self._literals = np.zeros((n_sets, n_rules, n_clauses, n_literals, 2),
+                                  dtype=np.intp)
+        self._rule_weights = np.zeros((n_sets, n_rules))
+        self._rule_outputs = np.zeros((n_sets, n_rules, len(output_terms)))
+
+        for s, set_rules in enumerate(flattened):
+            for r, (clauses, output_index, weight) in enumerate(set_rules):
+                for c in range(n_clauses):
+                    clause = clauses[c] if c < len(clauses) else clauses[0]
+                    for k in range(n_literals):
+                        literal = clause[k] if k < len(clause) else clause[0]
+                        self._literals[s, r, c, k] = literal
+                self._rule_weights[s, r] = weight
+                self._rule_outputs[s, r, output_index] = 1.0
+
+        # Straight-line Python versions of each rule set, used by the
+        # NumPy path in place of the gather-based rule evaluation
+        self._rule_functions = [
+            self._compile_rule_set(name, set_rules, len(output_terms))
+            for name, set_rules in zip(self.rule_set_names, flattened)
+        ]
+
+        # Prefer the AOT-compiled kernel, which needs no JIT warm-up
+        self._kernel = None
+        if use_numba:
+            if _aot_kernels is not None:
+                self._kernel = (_aot_kernels.mamdani_compact if compact_tables
+                                else _aot_kernels.mamdani)
+            elif NUMBA_AVAILABLE:
+                self._kernel = _mamdani_kernel
+        self.use_numba = self._kernel is not None
+        if self.use_numba:
+            # Compile (or load from cache) now so the first real call is fast
+            self._run_kernel(self._lower.copy())
+
+    @staticmethod
+    def _compile_rule_set(name: str, set_rules: list, n_outputs: int):
+        """
+        Generate and compile a function evaluating one rule set.
+
+        The rule graph is unrolled into Python source with every input and
+        term index as a literal, e.g.::
+
+            def rules_north(mu):
+                r0 = min(mu[0][2], mu[4][3])
+                ...
+                return (max(r3, r7), ...)
+
+        Returns:
+            Function mapping memberships (nested list, as from
+            ``fuzzify(...).tolist()``) to the activation of each output term
+        """
+        lines = ["def rules(mu):"]
+        by_output = [[] for _ in range(n_outputs)]
+
+        for r, (clauses, output_index, weight) in enumerate(set_rules):
+            terms = []
+            for clause in clauses:
+                literals = [f"mu[{i}][{j}]" for i, j in clause]
+                terms.append(literals[0] if len(literals) == 1
+                             else f"max({', '.join(literals)})")
+            strength = terms[0] if len(terms) == 1 else f"min({', '.join(terms)})"
+            if weight != 1.0:
+                strength = f"{strength} * {weight!r}"
+            lines.append(f"    r{r} = {strength}")
+            by_output[output_index].append(f"r{r}")
+
+        activations = []
+        for names in by_output:
+            if not names:
+                activations.append("0.0")
+            elif len(names) == 1:
+                activations.append(names[0])
+            else:
+                activations.append(f"max({', '.join(names)})")
+        lines.append(f"    return ({', '.join(activations)},)")
+
+        namespace = {}
+        exec(compile("\n".join(lines), f"<fuzzy_rules_{name}>", "exec"), namespace)
+        return namespace["rules"]
+
+    def _run_kernel(self, inputs: np.ndarray, rule_set: int = -1) -> np.ndarray:
+        """
+        Evaluate all rule sets, or only rule_set when it is non-negative
+        (other entries of the result are then undefined), with the compiled
+        kernel.
+        """
+        out = np.empty(len(self.rule_set_names))
+        self._kernel(np.asarray(inputs, dtype=np.float64),
+                     self._lower, self._upper, self._step, self._last_index,
+                     self.input_mfs, self.interpolate, self._literals,
+                     self._rule_weights, self._rule_outputs, self.output_mfs,
+                     self._mf_scale,
+                     self._centroid_num, self._centroid_den, rule_set, out)
+        return out
+
+    def fuzzify(self, inputs: np.ndarray) -> np.ndarray:
+        """
+        Compute membership degrees of every input in every term.
+
+        Args:
+            inputs: Crisp values ordered as ``input_labels``
+
+        Returns:
+            Array of shape (n_inputs, n_terms)
+        """
+        x = np.clip(inputs, self._lower, self._upper)
+        position = (x - self._lower) / self._step
+        rows = self._input_rows
+
+        if not self.interpolate:
+            return (self.input_mfs[rows, np.rint(position).astype(np.intp)] *
+                    self._mf_scale)
+
+        lo = np.minimum(position.astype(np.intp), self._last_index)
+        frac = (position - lo)[:, None]
+
+        return (self.input_mfs[rows, lo] * (1.0 - frac) +
+                self.input_mfs[rows, lo + 1] * frac) * self._mf_scale
+
+    def rule_strengths(self,
+                       memberships: np.ndarray,
+                       rule_set: Optional[int] = None) -> np.ndarray:
+        """
+        Firing strength of every rule.
+
+        Args:
+            memberships: Output of ``fuzzify``
+            rule_set: Rule set index, or None for all rule sets at once
+
+        Returns:
+            Array of shape (n_rules,), or (n_sets, n_rules) when rule_set is None
+        """
+        if rule_set is None:
+            literals, weights = self._literals, self._rule_weights
+        else:
+            literals, weights = self._literals[rule_set], self._rule_weights[rule_set]
+
+        mu = memberships[literals[..., 0], literals[..., 1]]
+        return mu.max(axis=-1).min(axis=-1) * weights
+
+    def defuzzify(self,
+                  strengths: np.ndarray,
+                  rule_set: Optional[int] = None) -> np.ndarray:
+        """
+        Aggregate rule outputs and return the centroid.
+
+        Args:
+            strengths: Output of ``rule_strengths`` for the same rule_set
+            rule_set: Rule set index, or None for all rule sets at once
+
+        Returns:
+            Centroid as a 0-d array, or one centroid per rule set
+        """
+        rule_outputs = (self._rule_outputs if rule_set is None
+                        else self._rule_outputs[rule_set])
+
+        activation = (strengths[..., None] * rule_outputs).max(axis=-2)
+        return self._centroid(activation)
+
+    def _centroid(self, activation: np.ndarray) -> np.ndarray:
+        """Clip, aggregate and defuzzify output term activations."""
+        output_mfs = self.output_mfs * self._mf_scale
+        aggregated = np.minimum(activation[..., None], output_mfs).max(axis=-2)
+
+        n_points = aggregated.shape[-1]
+        if aggregated.ndim == 1 and _c_centroid is not None and n_points >= 8:
+            aggregated = np.ascontiguousarray(aggregated, dtype=np.float64)
+            result = _c_centroid(aggregated.ctypes.data, self._centroid_num.ctypes.data,
+                                 self._centroid_den.ctypes.data, n_points)
+            if np.isnan(result):
+                raise ValueError("No rule fired; output membership is empty")
+            return np.float64(result)
+
+        area = aggregated @ self._centroid_den
+        if np.any(area <= 0):
+            raise ValueError("No rule fired; output membership is empty")
+        return aggregated @ self._centroid_num / area
+
+    @staticmethod
+    def _checked(outputs: np.ndarray) -> np.ndarray:
+        """Reject kernel outputs where no rule fired."""
+        if np.isnan(outputs).any():
+            raise ValueError("No rule fired; output membership is empty")
+        return outputs
+
+    def compute(self, inputs: np.ndarray, rule_set: int) -> float:
+        """
+        Run Mamdani inference for one rule set.
+
+        Args:
+            inputs: Crisp values ordered as ``input_labels``
+            rule_set: Index of the rule set (see ``rule_set_names``)
+
+        Returns:
+            Defuzzified output value
+        """
+        if self.use_numba:
+            output = self._run_kernel(inputs, rule_set)[rule_set]
+            if np.isnan(output):
+                raise ValueError("No rule fired; output membership is empty")
+            return float(output)
+
+        memberships = self.fuzzify(inputs).tolist()
+        activation = self._rule_functions[rule_set](memberships)
+        return float(self._centroid(np.array(activation)))
+
+    def compute_all(self, inputs: np.ndarray) -> np.ndarray:
+        """
+        Run Mamdani inference for every rule set in one batched pass.
+
+        The inputs are fuzzified once and shared by all rule sets.
+
+        Args:
+            inputs: Crisp values ordered as ``input_labels``
+
+        Returns:
+            Array of outputs ordered as ``rule_set_names``
+        """
+        if self.use_numba:
+            return self._checked(self._run_kernel(inputs))
+
+        memberships = self.fuzzify(inputs).tolist()
+        activation = [rules(memberships) for rules in self._rule_functions]
+        return self._centroid(np.array(activation))
@@ -0,0 +1,134 @@
+"""
+Precomputed Green Time Lookup Table
+
+Evaluates the fuzzy controller once on a coarse grid over all 8 inputs and
+stores the crisp green times, so inference becomes a nearest-grid-point
+array read. Tables can be saved to / loaded from ``.npz`` files.
+
+The grid is coarse (by default 5 density levels x 4 waiting levels per
+direction), so lookups approximate the full inference; use it where speed
+matters more than the exact fuzzy surface.
+"""
+
+import numpy as np
+from typing import List, Sequence
+
+from .inference import FastMamdaniEngine
+
+
+DEFAULT_DENSITY_LEVELS = (0.0, 25.0, 50.0, 75.0, 100.0)
+DEFAULT_WAITING_LEVELS = (0.0, 100.0, 200.0, 300.0)
+
+
+class GreenTimeTable:
+    """
+    Green times for every rule set, tabulated on a grid of input values.
+
+    ``table[set, i0, ..., i7]`` is the output of rule set ``set`` for the
+    input vector ``(levels[0][i0], ..., levels[7][i7])``.
+    """
+
+    def __init__(self,
+                 levels: Sequence[Sequence[float]],
+                 table: np.ndarray,
+                 rule_set_names: List[str]):
+        """
+        Args:
+            levels: Grid values for each input, in input vector order
+            table: Array of shape (n_sets, len(levels[0]), ..., len(levels[-1]))
+            rule_set_names: Rule set (direction) name for each table slice
+        """
+        self.levels = [np.asarray(values, dtype=np.float64) for values in levels]
+        self.table = np.asarray(table, dtype=np.float32)
+        self.rule_set_names = list(rule_set_names)
+
+        expected = (len(self.rule_set_names), *(len(v) for v in self.levels))
+        if self.table.shape != expected:
+            raise ValueError(f"Table shape {self.table.shape} does not match "
+                             f"grid {expected}")
+
+        # Bucket edges halfway between grid values, for nearest-point lookup
+        self._edges = [(values[1:] + values[:-1]) / 2 for values in self.levels]
+
+    @classmethod
+    def build(cls,
+              engine: FastMamdaniEngine,
+              density_levels: Sequence[float] = DEFAULT_DENSITY_LEVELS,
+              waiting_levels: Sequence[float] = DEFAULT_WAITING_LEVELS,
+              n_density_inputs: int = 4) -> "GreenTimeTable":
+        """
+        Tabulate an engine over a grid.
+
+        Args:
+            engine: Inference engine to evaluate
+            density_levels: Grid values for each density input
+            waiting_levels: Grid values for each waiting time input
+            n_density_inputs: Number of leading inputs that are densities
+
+        Returns:
+            GreenTimeTable covering all of the engine's rule sets
+        """
+        n_inputs = len(engine.input_labels)
+        levels = ([density_levels] * n_density_inputs +
+                  [waiting_levels] * (n_inputs - n_density_inputs))
+        levels = [np.asarray(values, dtype=np.float64) for values in levels]
+
+        shape = tuple(len(values) for values in levels)
+        table = np.empty((len(engine.rule_set_names), *shape), dtype=np.float32)
+
+        inputs = np.empty(n_inputs)
+        for index in np.ndindex(*shape):
+            for i, j in enumerate(index):
+                inputs[i] = levels[i][j]
+            table[(slice(None), *index)] = engine.compute_all(inputs)
+
+        return cls(levels, table, engine.rule_set_names)
+
+    def lookup(self, inputs: np.ndarray) -> np.ndarray:
+        """
+        Green times of all rule sets at the grid point nearest to inputs.
+
+        Args:
+            inputs: Crisp values in input vector order
+
+        Returns:
+            Array of outputs ordered as ``rule_set_names``
+        """
+        index = tuple(int(np.searchsorted(edges, x)) for edges, x in zip(self._edges, inputs))
+        return self.table[(slice(None), *index)].astype(np.float64)
+
+    def save(self, path: str):
+        """Save the table to a ``.npz`` file."""
+        np.savez_compressed(
+            path,
+            table=self.table,
+            rule_set_names=np.array(self.rule_set_names),
+            **{f"levels_{i}": values for i, values in enumerate(self.levels)}
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "GreenTimeTable":
+        """Load a table written by ``save``."""
+        with np.load(path) as data:
+            table = data['table']
+            levels = [data[f"levels_{i}"] for i in range(table.ndim - 1)]
+            return cls(levels, table, data['rule_set_names'].tolist())
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from .controller import FuzzyTrafficController
+
+    output = sys.argv[1] if len(sys.argv) > 1 else "green_time_table.npz"
+
+    print("Building green time lookup table...")
+    controller = FuzzyTrafficController(cache_tolerance=None)
+    start = time.perf_counter()
+    lookup_table = GreenTimeTable.build(controller.engine)
+    print(f"  Grid: {lookup_table.table.shape[1:]} per direction")
+    print(f"  Built in {time.perf_counter() - start:.1f}s")
+
+    lookup_table.save(output)
+    print(f"✓ Saved to {output}")
@@ -8,9 +8,58 @@ Defines membership functions for:
 """
 
 import numpy as np
-import skfuzzy as fuzz
 from skfuzzy import control as ctrl
-from typing import Dict, Tuple
+from typing import Dict, Sequence, Tuple
+
+
+# Triangle [a, b, c] parameters for each term, in term order
+DENSITY_TERMS = {
+    'low': [0, 0, 50],
+    'medium': [20, 50, 80],
+    'high': [50, 100, 100],
+}
+WAITING_TERMS = {
+    'short': [0, 0, 60],
+    'medium': [40, 100, 160],
+    'long': [120, 200, 280],
+    'very_long': [240, 300, 300],
+}
+GREEN_TIME_TERMS = {
+    'short': [10, 10, 30],
+    'medium': [25, 40, 55],
+    'long': [50, 60, 70],
+    'very_long': [65, 90, 90],
+}
+
+
+def trimf_batch(universe: np.ndarray, abc: Sequence[Sequence[float]]) -> np.ndarray:
+    """
+    Evaluate several triangular membership functions in one broadcast pass.
+
+    Equivalent to stacking ``fuzz.trimf(universe, row)`` for each row of abc,
+    including the shoulder cases a == b and b == c.
+
+    Args:
+        universe: Universe of discourse
+        abc: Array-like of shape (n_terms, 3) with a <= b <= c per row
+
+    Returns:
+        Array of shape (n_terms, len(universe))
+    """
+    x = np.asarray(universe, dtype=np.float64)[None, :]
+    abc = np.asarray(abc, dtype=np.float64)
+    a, b, c = abc[:, 0:1], abc[:, 1:2], abc[:, 2:3]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        left = np.where(b != a, (x - a) / (b - a), (x >= a).astype(np.float64))
+        right = np.where(c != b, (c - x) / (c - b), (x <= c).astype(np.float64))
+    return np.clip(np.minimum(left, right), 0.0, 1.0)
+
+
+def _assign_terms(variable, terms: Dict[str, Sequence[float]], mfs: np.ndarray):
+    """Attach precomputed membership arrays to a fuzzy variable."""
+    for term, mf in zip(terms, mfs):
+        variable[term] = mf
 
 
 def create_membership_functions() -> Tuple[Dict[str, ctrl.Antecedent], ctrl.Consequent]:
@@ -24,17 +73,21 @@ def create_membership_functions() -> Tuple[Dict[str, ctrl.Antecedent], ctrl.Cons
     """
 
     # Input Variables (Antecedents)
+    # Each direction keeps its own Antecedent (the rule graph needs distinct
+    # nodes), but all directions share one universe and one set of term arrays
     # Vehicle density for each direction (0-100 vehicles)
-    density_north = ctrl.Antecedent(np.arange(0, 101, 1), 'density_north')
-    density_south = ctrl.Antecedent(np.arange(0, 101, 1), 'density_south')
-    density_east = ctrl.Antecedent(np.arange(0, 101, 1), 'density_east')
-    density_west = ctrl.Antecedent(np.arange(0, 101, 1), 'density_west')
+    density_universe = np.arange(0, 101, 1)
+    density_north = ctrl.Antecedent(density_universe, 'density_north')
+    density_south = ctrl.Antecedent(density_universe, 'density_south')
+    density_east = ctrl.Antecedent(density_universe, 'density_east')
+    density_west = ctrl.Antecedent(density_universe, 'density_west')
 
     # Waiting time for each direction (0-300 seconds)
-    waiting_north = ctrl.Antecedent(np.arange(0, 301, 1), 'waiting_north')
-    waiting_south = ctrl.Antecedent(np.arange(0, 301, 1), 'waiting_south')
-    waiting_east = ctrl.Antecedent(np.arange(0, 301, 1), 'waiting_east')
-    waiting_west = ctrl.Antecedent(np.arange(0, 301, 1), 'waiting_west')
+    waiting_universe = np.arange(0, 301, 1)
+    waiting_north = ctrl.Antecedent(waiting_universe, 'waiting_north')
+    waiting_south = ctrl.Antecedent(waiting_universe, 'waiting_south')
+    waiting_east = ctrl.Antecedent(waiting_universe, 'waiting_east')
+    waiting_west = ctrl.Antecedent(waiting_universe, 'waiting_west')
 
     # Output Variable (Consequent)
     # Green light duration (10-90 seconds)
@@ -42,25 +95,20 @@ def create_membership_functions() -> Tuple[Dict[str, ctrl.Antecedent], ctrl.Cons
 
     # Define membership functions for vehicle density
     # Low: 0-50, Medium: 20-80, High: 50-100
+    density_mfs = trimf_batch(density_universe, list(DENSITY_TERMS.values()))
     for density in [density_north, density_south, density_east, density_west]:
-        density['low'] = fuzz.trimf(density.universe, [0, 0, 50])
-        density['medium'] = fuzz.trimf(density.universe, [20, 50, 80])
-        density['high'] = fuzz.trimf(density.universe, [50, 100, 100])
+        _assign_terms(density, DENSITY_TERMS, density_mfs)
 
     # Define membership functions for waiting time
-    # Short: 0-60s, Medium: 40-120s, Long: 100-200s, Very Long: 180-300s
+    # Short: 0-60s, Medium: 40-160s, Long: 120-280s, Very Long: 240-300s
+    waiting_mfs = trimf_batch(waiting_universe, list(WAITING_TERMS.values()))
     for waiting in [waiting_north, waiting_south, waiting_east, waiting_west]:
-        waiting['short'] = fuzz.trimf(waiting.universe, [0, 0, 60])
-        waiting['medium'] = fuzz.trimf(waiting.universe, [40, 100, 160])
-        waiting['long'] = fuzz.trimf(waiting.universe, [120, 200, 280])
-        waiting['very_long'] = fuzz.trimf(waiting.universe, [240, 300, 300])
+        _assign_terms(waiting, WAITING_TERMS, waiting_mfs)
 
     # Define membership functions for green time output
     # Short: 10-30s, Medium: 25-55s, Long: 50-70s, Very Long: 65-90s
-    green_time['short'] = fuzz.trimf(green_time.universe, [10, 10, 30])
-    green_time['medium'] = fuzz.trimf(green_time.universe, [25, 40, 55])
-    green_time['long'] = fuzz.trimf(green_time.universe, [50, 60, 70])
-    green_time['very_long'] = fuzz.trimf(green_time.universe, [65, 90, 90])
+    _assign_terms(green_time, GREEN_TIME_TERMS,
+                  trimf_batch(green_time.universe, list(GREEN_TIME_TERMS.values())))
 
     # Collect all antecedents
     antecedents = {
@@ -7,198 +7,254 @@ Generates comprehensive analysis and exports results for web visualization.
 
 import json
 import logging
-from typing import Dict, Tuple
+import math
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Mapping, Optional, Tuple
 from pathlib import Path
 
-from fuzzy_controller.controller import FuzzyTrafficController
+import numpy as np
+
+from fuzzy_controller.controller import FuzzyTrafficController, TrafficStateArray
 from simulation.traffic_model import TrafficSimulator, LightState
 from simulation.fixed_controller import FixedTimeController
 from simulation.scenarios import Scenarios
 from utils.metrics import PerformanceMetrics
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Light states shown during each fuzzy controller phase
+_NS_GREEN_LIGHTS = {'north': LightState.GREEN, 'south': LightState.GREEN,
+                    'east': LightState.RED, 'west': LightState.RED}
+_NS_YELLOW_LIGHTS = {'north': LightState.YELLOW, 'south': LightState.YELLOW,
+                     'east': LightState.RED, 'west': LightState.RED}
+_EW_GREEN_LIGHTS = {'north': LightState.RED, 'south': LightState.RED,
+                    'east': LightState.GREEN, 'west': LightState.GREEN}
+_EW_YELLOW_LIGHTS = {'north': LightState.RED, 'south': LightState.RED,
+                     'east': LightState.YELLOW, 'west': LightState.YELLOW}
+_ALL_RED_LIGHTS = {d: LightState.RED for d in ['north', 'south', 'east', 'west']}
+
+# Phase transitions: current phase -> (next phase, lights, duration).
+# A duration of None means the next phase is green and its length comes
+# from the fuzzy controller, averaged over the axis in _GREEN_AXES.
+_PHASE_TABLE = {
+    'init': ('ns_green', _NS_GREEN_LIGHTS, None),
+    'ns_green': ('ns_yellow', _NS_YELLOW_LIGHTS, 3.0),
+    'ns_yellow': ('all_red_1', _ALL_RED_LIGHTS, 2.0),
+    'all_red_1': ('ew_green', _EW_GREEN_LIGHTS, None),
+    'ew_green': ('ew_yellow', _EW_YELLOW_LIGHTS, 3.0),
+    'ew_yellow': ('all_red_2', _ALL_RED_LIGHTS, 2.0),
+    'all_red_2': ('ns_green', _NS_GREEN_LIGHTS, None),
+}
+_GREEN_AXES = {
+    'ns_green': ('north', 'south'),
+    'ew_green': ('east', 'west'),
+}
+
+
+def _prepare_simulator(scenario, duration: float,
+                       simulator: Optional[TrafficSimulator] = None) -> TrafficSimulator:
+    """Create a simulator for a scenario, or reset one already built for it."""
+    if simulator is None:
+        return TrafficSimulator(
+            arrival_rates=scenario.arrival_rates,
+            simulation_duration=duration,
+            random_seed=42  # Same seed for fair comparison
+        )
+
+    simulator.reset(random_seed=42)
+    return simulator
+
+
+def _steps_until(remaining: float, simulator: TrafficSimulator,
+                 duration: float, time_step: float) -> int:
+    """
+    Whole time steps until a phase with `remaining` seconds left ends.
+
+    Matches per-step polling of ``time_in_phase >= phase_duration``: at least
+    one step, and never past the end of the simulation.
+    """
+    phase_steps = max(math.ceil(remaining / time_step), 1)
+    end_steps = math.ceil((duration - simulator.current_time) / time_step)
+    return min(phase_steps, end_steps)
+
 
-def run_simulation_with_fuzzy(scenario, duration: float = 1800) -> PerformanceMetrics:
+def run_simulation_with_fuzzy(scenario, duration: float = 1800,
+                              simulator: Optional[TrafficSimulator] = None
+                              ) -> PerformanceMetrics:
     """
     Run simulation with fuzzy controller.
 
     Args:
         scenario: TrafficScenario object
         duration: Simulation duration in seconds
+        simulator: Simulator to reuse (reset before the run); a new one is
+            created for the scenario when omitted
 
     Returns:
         PerformanceMetrics object
     """
-    print(f"  Running with Fuzzy Controller...")
-
     # Initialize
-    simulator = TrafficSimulator(
-        arrival_rates=scenario.arrival_rates,
-        simulation_duration=duration,
-        random_seed=42
-    )
-    controller = FuzzyTrafficController(enable_logging=False)
+    simulator = _prepare_simulator(scenario, duration, simulator)
+    # skfuzzy's exact inference: the vectorized engine differs by up to
+    # ~0.06 s, which can move a green time across a whole-step boundary
+    # and change the published comparison
+    controller = FuzzyTrafficController(enable_logging=False, fast_inference=False)
     metrics = PerformanceMetrics(simulation_duration=duration)
+    # Directions never change during a run, so bind them once
+    direction_items = [(d, simulator.directions[d])
+                       for d in ['north', 'south', 'east', 'west']]
+    # Traffic state buffers (north, south, east, west), reused every phase
+    traffic_state = TrafficStateArray(np.empty(4), np.empty(4))
 
     time_step = 1.0
     current_phase = 'init'  # Start with initialization phase
-    phase_start_time = 0.0
-    phase_duration = 0.0
 
+    # Event-driven: each iteration starts a phase and jumps to its end
     while simulator.current_time < duration:
-        # Get current traffic state
-        traffic_state = simulator.get_traffic_state()
-
-        # Record metrics
-        queue_state = {
-            'queue_lengths': {d: simulator.directions[d].queue_length
-                            for d in ['north', 'south', 'east', 'west']}
-        }
-        metrics.record_timestep(simulator.current_time, queue_state)
-
-        # Check if we need to compute new phase duration
-        time_in_phase = simulator.current_time - phase_start_time
-
-        if time_in_phase >= phase_duration:
-            # Switch phase based on current state
-            if current_phase == 'init':
-                # Initialize with NS green
-                ns_green = (controller.compute_green_time('north', traffic_state) +
-                           controller.compute_green_time('south', traffic_state)) / 2
-                phase_duration = ns_green
-                phase_start_time = simulator.current_time
-                current_phase = 'ns_green'
-                simulator.set_all_lights({
-                    'north': LightState.GREEN,
-                    'south': LightState.GREEN,
-                    'east': LightState.RED,
-                    'west': LightState.RED
-                })
-            elif current_phase == 'ns_green':
-                # NS green finished, go to yellow
-                phase_duration = 3.0
-                phase_start_time = simulator.current_time
-                current_phase = 'ns_yellow'
-                simulator.set_all_lights({
-                    'north': LightState.YELLOW,
-                    'south': LightState.YELLOW,
-                    'east': LightState.RED,
-                    'west': LightState.RED
-                })
-            elif current_phase == 'ns_yellow':
-                # NS yellow finished, go to all red
-                phase_duration = 2.0
-                phase_start_time = simulator.current_time
-                current_phase = 'all_red_1'
-                simulator.set_all_lights({d: LightState.RED
-                                        for d in ['north', 'south', 'east', 'west']})
-            elif current_phase == 'all_red_1':
-                # Compute green time for EW
-                ew_green = (controller.compute_green_time('east', traffic_state) +
-                           controller.compute_green_time('west', traffic_state)) / 2
-                phase_duration = ew_green
-                phase_start_time = simulator.current_time
-                current_phase = 'ew_green'
-                simulator.set_all_lights({
-                    'north': LightState.RED,
-                    'south': LightState.RED,
-                    'east': LightState.GREEN,
-                    'west': LightState.GREEN
-                })
-            elif current_phase == 'ew_green':
-                phase_duration = 3.0
-                phase_start_time = simulator.current_time
-                current_phase = 'ew_yellow'
-                simulator.set_all_lights({
-                    'north': LightState.RED,
-                    'south': LightState.RED,
-                    'east': LightState.YELLOW,
-                    'west': LightState.YELLOW
-                })
-            elif current_phase == 'ew_yellow':
-                phase_duration = 2.0
-                phase_start_time = simulator.current_time
-                current_phase = 'all_red_2'
-                simulator.set_all_lights({d: LightState.RED
-                                        for d in ['north', 'south', 'east', 'west']})
-            elif current_phase == 'all_red_2':
-                # Back to NS green
-                ns_green = (controller.compute_green_time('north', traffic_state) +
-                           controller.compute_green_time('south', traffic_state)) / 2
-                phase_duration = ns_green
-                phase_start_time = simulator.current_time
-                current_phase = 'ns_green'
-                simulator.set_all_lights({
-                    'north': LightState.GREEN,
-                    'south': LightState.GREEN,
-                    'east': LightState.RED,
-                    'west': LightState.RED
-                })
-
-        # Step simulation
-        simulator.step(time_step)
-
-        # Record departures from this timestep
-        for direction, dir_state in simulator.directions.items():
-            for vehicle in dir_state.recent_departures:
-                metrics.record_departure(direction, vehicle.waiting_time)
+        # Advance to the next phase; green phases get a fuzzy duration
+        current_phase, lights, phase_duration = _PHASE_TABLE[current_phase]
+        if phase_duration is None:
+            first, second = _GREEN_AXES[current_phase]
+            simulator.get_traffic_state_into(*traffic_state)
+            green_times = controller.compute_all_green_times(traffic_state)
+            phase_duration = (green_times[first] + green_times[second]) / 2
+        simulator.set_all_lights(lights)
+
+        # Step to the phase boundary, recording queue lengths every step
+        simulator.step(time_step, _steps_until(phase_duration, simulator, duration, time_step),
+                       on_step=metrics.record_queue_lengths)
+
+        # Record departures from this phase
+        for direction, dir_state in direction_items:
+            if dir_state.num_recent_departures:
+                metrics.record_departures(direction, dir_state.recent_waiting_times())
 
     return metrics
 
 
-def run_simulation_with_fixed(scenario, duration: float = 1800) -> PerformanceMetrics:
+def run_simulation_with_fixed(scenario, duration: float = 1800,
+                              simulator: Optional[TrafficSimulator] = None
+                              ) -> PerformanceMetrics:
     """
     Run simulation with fixed-time controller.
 
     Args:
         scenario: TrafficScenario object
         duration: Simulation duration in seconds
+        simulator: Simulator to reuse (reset before the run); a new one is
+            created for the scenario when omitted
 
     Returns:
         PerformanceMetrics object
     """
-    print(f"  Running with Fixed-Time Controller...")
-
     # Initialize
-    simulator = TrafficSimulator(
-        arrival_rates=scenario.arrival_rates,
-        simulation_duration=duration,
-        random_seed=42  # Same seed for fair comparison
-    )
+    simulator = _prepare_simulator(scenario, duration, simulator)
     controller = FixedTimeController(ns_green=40, ew_green=40,
                                      yellow_time=3, all_red_time=2)
     metrics = PerformanceMetrics(simulation_duration=duration)
+    # Directions never change during a run, so bind them once
+    direction_items = [(d, simulator.directions[d])
+                       for d in ['north', 'south', 'east', 'west']]
 
     time_step = 1.0
 
+    # Event-driven: each iteration applies the current phase and jumps to
+    # its end, so light states are converted once per phase
     while simulator.current_time < duration:
-        # Get light states from fixed controller
-        light_states = controller.get_light_states()
+        simulator.set_all_lights({direction: LightState(state_str)
+                                  for direction, state_str
+                                  in controller.get_light_states().items()})
+
+        # Step both simulator and controller to the phase boundary,
+        # recording queue lengths every step
+        phase = controller.get_current_phase()
+        phase_steps = _steps_until(phase.duration - controller.time_in_current_phase,
+                                   simulator, duration, time_step)
+        simulator.step(time_step, phase_steps, on_step=metrics.record_queue_lengths)
+        controller.step(time_step * phase_steps)
+
+        # Record departures from this phase
+        for direction, dir_state in direction_items:
+            if dir_state.num_recent_departures:
+                metrics.record_departures(direction, dir_state.recent_waiting_times())
+
+    return metrics
 
-        # Apply to simulator
-        for direction, state_str in light_states.items():
-            simulator.set_light_state(direction, LightState(state_str))
 
-        # Record metrics
-        queue_state = {
-            'queue_lengths': {d: simulator.directions[d].queue_length
-                            for d in ['north', 'south', 'east', 'west']}
-        }
-        metrics.record_timestep(simulator.current_time, queue_state)
+def _run_scenario(scenario) -> Tuple[Dict, Dict, Dict]:
+    """
+    Run both controllers on one scenario.
 
-        # Step both simulator and controller
-        simulator.step(time_step)
-        controller.step(time_step)
+    Returns:
+        Tuple of (fuzzy summary, fixed summary, comparison)
+    """
+    # Both controllers run on one simulator, reset between runs
+    duration = min(scenario.duration, 1800)
+    simulator = _prepare_simulator(scenario, duration)
 
-        # Record departures from this timestep
-        for direction, dir_state in simulator.directions.items():
-            for vehicle in dir_state.recent_departures:
-                metrics.record_departure(direction, vehicle.waiting_time)
+    fuzzy_metrics = run_simulation_with_fuzzy(scenario, duration=duration,
+                                              simulator=simulator)
+    fixed_metrics = run_simulation_with_fixed(scenario, duration=duration,
+                                              simulator=simulator)
 
-    return metrics
+    return (fuzzy_metrics.get_summary(), fixed_metrics.get_summary(),
+            fuzzy_metrics.compare_with(fixed_metrics))
 
 
-def compare_scenarios():
-    """Run comparison across all scenarios and generate results"""
+def _run_all_scenarios(scenarios: Mapping, max_workers: Optional[int] = None) -> list:
+    """
+    Run every scenario, in parallel processes when possible.
+
+    Each run seeds its own simulator, so the results are the same as running
+    the scenarios one after the other.
+    """
+    scenario_list = list(scenarios.values())
+    results = [None] * len(scenario_list)
+
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(_run_scenario, scenario): index
+                       for index, scenario in enumerate(scenario_list)}
+            # Report each scenario as it finishes, keep results in order
+            for future in as_completed(futures):
+                index = futures[future]
+                results[index] = future.result()
+                print(f"  {scenario_list[index].name} done")
+        return results
+    except (OSError, NotImplementedError, BrokenProcessPool) as e:
+        print(f"Process pool unavailable ({e}), running sequentially")
+
+    for index, scenario in enumerate(scenario_list):
+        results[index] = _run_scenario(scenario)
+        print(f"  {scenario.name} done")
+    return results
+
+
+def _write_json(path: Path, data: Dict):
+    """Write data as indented JSON, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        path.write_bytes(orjson.dumps(
+            data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+        ))
+    else:
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+
+def compare_scenarios(max_workers: Optional[int] = None):
+    """
+    Run comparison across all scenarios and generate results
+
+    Args:
+        max_workers: Worker processes for the scenario runs
+            (None uses one per CPU)
+    """
     print("=" * 70)
     print("FUZZY VS FIXED-TIME TRAFFIC CONTROLLER COMPARISON")
     print("=" * 70)
@@ -206,7 +262,11 @@ def compare_scenarios():
     scenarios = Scenarios.all_scenarios()
     results = {}
 
-    for scenario_key, scenario in scenarios.items():
+    print(f"\nRunning {len(scenarios)} scenarios...")
+    scenario_results = _run_all_scenarios(scenarios, max_workers)
+
+    for (scenario_key, scenario), (fuzzy_summary, fixed_summary, comparison) in zip(
+            scenarios.items(), scenario_results):
         print(f"\n{'='*70}")
         print(f"Scenario: {scenario.name}")
         print(f"{'='*70}")
@@ -214,17 +274,10 @@ def compare_scenarios():
         print(f"Duration: {scenario.duration}s")
         print(f"Arrival rates: {scenario.arrival_rates}")
 
-        # Run with fuzzy
-        fuzzy_metrics = run_simulation_with_fuzzy(scenario, duration=min(scenario.duration, 1800))
-
-        # Run with fixed
-        fixed_metrics = run_simulation_with_fixed(scenario, duration=min(scenario.duration, 1800))
-
         # Print comparison
         print(f"\n{'-'*70}")
         print("FUZZY CONTROLLER RESULTS:")
         print(f"{'-'*70}")
-        fuzzy_summary = fuzzy_metrics.get_summary()
         print(f"  Avg Waiting Time:     {fuzzy_summary['average_waiting_time']:.2f}s")
         print(f"  Max Waiting Time:     {fuzzy_summary['max_waiting_time']:.2f}s")
         print(f"  Avg Queue Length:     {fuzzy_summary['average_queue_length']:.2f}")
@@ -235,7 +288,6 @@ def compare_scenarios():
         print(f"\n{'-'*70}")
         print("FIXED-TIME CONTROLLER RESULTS:")
         print(f"{'-'*70}")
-        fixed_summary = fixed_metrics.get_summary()
         print(f"  Avg Waiting Time:     {fixed_summary['average_waiting_time']:.2f}s")
         print(f"  Max Waiting Time:     {fixed_summary['max_waiting_time']:.2f}s")
         print(f"  Avg Queue Length:     {fixed_summary['average_queue_length']:.2f}")
@@ -243,9 +295,6 @@ def compare_scenarios():
         print(f"  Throughput:           {fixed_summary['throughput_per_hour']:.1f} veh/h")
         print(f"  Fairness Index:       {fixed_summary['fairness_index']:.3f}")
 
-        # Calculate improvements
-        comparison = fuzzy_metrics.compare_with(fixed_metrics)
-
         print(f"\n{'-'*70}")
         print("IMPROVEMENT (Fuzzy vs Fixed):")
         print(f"{'-'*70}")
@@ -271,8 +320,7 @@ def compare_scenarios():
     output_dir = Path('web/data')
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    with open(output_dir / 'comparison_results.json', 'w') as f:
-        json.dump(results, f, indent=2)
+    _write_json(output_dir / 'comparison_results.json', results)
 
     print(f"\n{'='*70}")
     print(f"✓ Results exported to web/data/comparison_results.json")
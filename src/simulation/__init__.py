@@ -1,6 +1,6 @@
 """Traffic Simulation Module"""
 
 from .traffic_model import TrafficSimulator
-from .fixed_controller import FixedTimeController
+from .fixed_controller import FixedTimeController, FixedTimeControllerArray
 
-__all__ = ["TrafficSimulator", "FixedTimeController"]
+__all__ = ["TrafficSimulator", "FixedTimeController", "FixedTimeControllerArray"]
@@ -5,10 +5,62 @@ Traditional traffic light controller with predetermined timing.
 Used as baseline for comparison with fuzzy controller.
 """
 
-from typing import Dict, List
+import numpy as np
+from typing import Dict, List, Sequence, Tuple
 from dataclasses import dataclass
 import logging
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# Light state names indexed by their integer code
+LIGHT_STATES = ('red', 'yellow', 'green')
+GREEN = LIGHT_STATES.index('green')
+
+_DIRECTIONS = ('north', 'south', 'east', 'west')
+
+# The fixed cycle: phase names and light codes for (north, south, east, west).
+# Only the phase durations are configurable.
+_PHASE_NAMES = ('NS_GREEN', 'NS_YELLOW', 'ALL_RED_1', 'EW_GREEN', 'EW_YELLOW', 'ALL_RED_2')
+_PHASE_STATES = (
+    (2, 2, 0, 0),  # North-South green
+    (1, 1, 0, 0),  # North-South yellow
+    (0, 0, 0, 0),  # All red (clearance)
+    (0, 0, 2, 2),  # East-West green
+    (0, 0, 1, 1),  # East-West yellow
+    (0, 0, 0, 0),  # All red (clearance)
+)
+_PHASE_LIGHTS = tuple(tuple(LIGHT_STATES[code] for code in codes) for codes in _PHASE_STATES)
+
+
+def _step_many(phase_index, time_in_phase, durations, num_steps, time_step):
+    """
+    Apply ``num_steps`` single steps of ``time_step`` to a cycle position.
+
+    Same update as ``FixedTimeController.step``, as a tight numeric loop.
+    Compiled with Numba when it is available.
+
+    Returns:
+        (phase_index, time_in_phase) after the last step
+    """
+    n_phases = durations.shape[0]
+    for _ in range(num_steps):
+        time_in_phase += time_step
+        if time_in_phase >= durations[phase_index]:
+            phase_index = (phase_index + 1) % n_phases
+            time_in_phase = 0.0
+    return phase_index, time_in_phase
+
+
+if NUMBA_AVAILABLE:
+    # The on-disk cache records the defining module by name, so it is only
+    # used when imported as part of the package (not run as a script)
+    _step_many = njit(cache=__name__ != "__main__")(_step_many)
+
 
 @dataclass
 class FixedPhase:
@@ -44,6 +96,8 @@ class FixedTimeController:
             all_red_time: All-red clearance time (seconds)
         """
         self.logger = logging.getLogger(__name__)
+        # Checked once so step() skips building debug messages when unused
+        self._debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
 
         self.ns_green = ns_green
         self.ew_green = ew_green
@@ -56,6 +110,32 @@ class FixedTimeController:
         self.current_phase_index = 0
         self.time_in_current_phase = 0.0
 
+        # Successor of each phase index, so wrapping needs no modulo
+        self._next_phase = tuple((i + 1) % len(self.phases) for i in range(len(self.phases)))
+
+        # Structure-of-arrays view of the static cycle: one state code per
+        # (phase, direction), phase durations, and light names per phase
+        self._state_matrix = np.array(_PHASE_STATES, dtype=np.uint8)
+        self._durations = np.array([phase.duration for phase in self.phases],
+                                   dtype=np.float64)
+        self._phase_lights = _PHASE_LIGHTS
+
+        # End time of each phase within the cycle, for lookups by absolute time
+        self._phase_ends = np.cumsum(self._durations)
+
+        # Phase index for every whole second of the cycle, when all phases
+        # last whole seconds; lets get_light_states_at index instead of search
+        self._phase_by_second = None
+        if np.all(self._durations == np.rint(self._durations)):
+            self._phase_by_second = np.repeat(np.arange(len(self.phases)),
+                                              self._durations.astype(np.int64)).tolist()
+
+        # The cycle is static, so time-to-green is tabulated per phase
+        self._green_offsets = self._build_green_offsets()
+
+        # Built on first get_schedule() call; timings are fixed after __init__
+        self._schedule_cache = None
+
         self.logger.info("Fixed-Time Controller initialized")
         self.logger.info(f"  N-S green: {ns_green}s")
         self.logger.info(f"  E-W green: {ew_green}s")
@@ -63,69 +143,39 @@ class FixedTimeController:
 
     def _build_cycle(self) -> List[FixedPhase]:
         """Build the complete traffic light cycle"""
-        phases = []
-
-        # Phase 1: North-South Green
-        phases.append(FixedPhase(
-            name="NS_GREEN",
-            duration=self.ns_green,
-            north_state="green",
-            south_state="green",
-            east_state="red",
-            west_state="red"
-        ))
-
-        # Phase 2: North-South Yellow
-        phases.append(FixedPhase(
-            name="NS_YELLOW",
-            duration=self.yellow_time,
-            north_state="yellow",
-            south_state="yellow",
-            east_state="red",
-            west_state="red"
-        ))
-
-        # Phase 3: All Red (clearance)
-        phases.append(FixedPhase(
-            name="ALL_RED_1",
-            duration=self.all_red_time,
-            north_state="red",
-            south_state="red",
-            east_state="red",
-            west_state="red"
-        ))
-
-        # Phase 4: East-West Green
-        phases.append(FixedPhase(
-            name="EW_GREEN",
-            duration=self.ew_green,
-            north_state="red",
-            south_state="red",
-            east_state="green",
-            west_state="green"
-        ))
-
-        # Phase 5: East-West Yellow
-        phases.append(FixedPhase(
-            name="EW_YELLOW",
-            duration=self.yellow_time,
-            north_state="red",
-            south_state="red",
-            east_state="yellow",
-            west_state="yellow"
-        ))
-
-        # Phase 6: All Red (clearance)
-        phases.append(FixedPhase(
-            name="ALL_RED_2",
-            duration=self.all_red_time,
-            north_state="red",
-            south_state="red",
-            east_state="red",
-            west_state="red"
-        ))
-
-        return phases
+        durations = (self.ns_green, self.yellow_time, self.all_red_time,
+                     self.ew_green, self.yellow_time, self.all_red_time)
+
+        return [FixedPhase(name, duration, *lights)
+                for name, duration, lights in zip(_PHASE_NAMES, durations, _PHASE_LIGHTS)]
+
+    def _build_green_offsets(self) -> Dict[str, List[float]]:
+        """
+        Tabulate, for each direction and phase index, the time from the start
+        of that phase until the next phase that gives the direction green.
+
+        Phases are searched cyclically starting after the given one; if none
+        is green for the direction, the offset is one full cycle.
+        """
+        n_phases = len(self.phases)
+        starts = np.arange(n_phases)
+
+        # Elapsed time at each boundary over two cycles, so a cyclic run of
+        # phases starting at any index is a difference of two entries
+        boundaries = np.concatenate(([0.0], np.cumsum(np.tile(self._durations, 2))))
+
+        offsets = {}
+        for k, direction in enumerate(_DIRECTIONS):
+            greens = np.flatnonzero(self._state_matrix[:, k] == GREEN)
+
+            # Phases from each start to the next green phase after it
+            distances = (greens[None, :] - starts[:, None]) % n_phases
+            distances = np.where(distances == 0, n_phases, distances)
+            steps = distances.min(axis=1) if len(greens) else np.full(n_phases, n_phases)
+
+            offsets[direction] = (boundaries[starts + steps] - boundaries[starts]).tolist()
+
+        return offsets
 
     def get_current_phase(self) -> FixedPhase:
         """Get the current phase"""
@@ -138,13 +188,28 @@ class FixedTimeController:
         Returns:
             Dictionary mapping direction to light state ('red', 'yellow', 'green')
         """
-        phase = self.get_current_phase()
-        return {
-            'north': phase.north_state,
-            'south': phase.south_state,
-            'east': phase.east_state,
-            'west': phase.west_state
-        }
+        return dict(zip(_DIRECTIONS, self._phase_lights[self.current_phase_index]))
+
+    def get_light_states_at(self, time: float) -> Dict[str, str]:
+        """
+        Get light states at an absolute time, without stepping.
+
+        Assumes the cycle started at time 0 with the first phase, so the
+        schedule can be queried at arbitrary times (e.g. by analysis tools).
+        Does not change the controller's own state.
+
+        Args:
+            time: Seconds since the start of the cycle
+
+        Returns:
+            Dictionary mapping direction to light state ('red', 'yellow', 'green')
+        """
+        offset = time % self.cycle_duration
+        if self._phase_by_second is not None:
+            phase_index = self._phase_by_second[int(offset)]
+        else:
+            phase_index = int(np.searchsorted(self._phase_ends, offset, side='right'))
+        return dict(zip(_DIRECTIONS, self._phase_lights[phase_index]))
 
     def step(self, time_step: float = 1.0):
         """
@@ -159,11 +224,31 @@ class FixedTimeController:
         current_phase = self.get_current_phase()
         if self.time_in_current_phase >= current_phase.duration:
             # Move to next phase
-            self.current_phase_index = (self.current_phase_index + 1) % len(self.phases)
+            self.current_phase_index = self._next_phase[self.current_phase_index]
             self.time_in_current_phase = 0.0
 
-            new_phase = self.get_current_phase()
-            self.logger.debug(f"Phase change: {current_phase.name} -> {new_phase.name}")
+            if self._debug_enabled:
+                new_phase = self.get_current_phase()
+                self.logger.debug(f"Phase change: {current_phase.name} -> {new_phase.name}")
+
+    def advance(self, num_steps: int, time_step: float = 1.0):
+        """
+        Advance the controller by several time steps at once.
+
+        Equivalent to calling ``step(time_step)`` ``num_steps`` times, without
+        the per-step Python overhead or phase-change logging; meant for batch
+        and offline runs over many cycles.
+
+        Args:
+            num_steps: Number of steps to apply
+            time_step: Time interval of each step (seconds)
+        """
+        phase_index, time_in_phase = _step_many(
+            self.current_phase_index, float(self.time_in_current_phase),
+            self._durations, int(num_steps), float(time_step)
+        )
+        self.current_phase_index = int(phase_index)
+        self.time_in_current_phase = float(time_in_phase)
 
     def get_time_until_next_green(self, direction: str) -> float:
         """
@@ -175,45 +260,29 @@ class FixedTimeController:
         Returns:
             Time in seconds until next green light
         """
-        time_remaining = 0.0
-        current_phase = self.get_current_phase()
-
-        # Time remaining in current phase
-        time_remaining = current_phase.duration - self.time_in_current_phase
-
-        # Check subsequent phases
-        phase_index = (self.current_phase_index + 1) % len(self.phases)
-
-        while True:
-            phase = self.phases[phase_index]
-
-            # Check if this phase gives green to our direction
-            light_state = getattr(phase, f"{direction}_state")
-            if light_state == "green":
-                return time_remaining
-
-            time_remaining += phase.duration
-            phase_index = (phase_index + 1) % len(self.phases)
-
-            # Prevent infinite loop (shouldn't happen with valid config)
-            if phase_index == self.current_phase_index:
-                break
-
-        return time_remaining
+        return (self._green_offsets[direction][self.current_phase_index] -
+                self.time_in_current_phase)
 
     def reset(self):
         """Reset controller to initial state"""
         self.current_phase_index = 0
         self.time_in_current_phase = 0.0
+        self._debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
         self.logger.info("Fixed-Time Controller reset")
 
     def get_schedule(self) -> List[Dict]:
         """
         Get the complete traffic light schedule for one cycle.
 
+        The schedule is built once and shared between calls, so callers
+        should not modify it.
+
         Returns:
             List of phase dictionaries
         """
+        if self._schedule_cache is not None:
+            return self._schedule_cache
+
         schedule = []
         current_time = 0.0
 
@@ -229,9 +298,74 @@ class FixedTimeController:
             })
             current_time += phase.duration
 
+        self._schedule_cache = schedule
         return schedule
 
 
+class FixedTimeControllerArray:
+    """
+    Many fixed-time controllers stepped together.
+
+    Holds the cycle position of N intersections as arrays, so one step is a
+    handful of NumPy operations over all of them instead of N Python calls.
+    Each intersection follows the same update as ``FixedTimeController.step``.
+    """
+
+    def __init__(self, timings: Sequence[Tuple[float, float, float, float]]):
+        """
+        Initialize the controller array.
+
+        Args:
+            timings: One (ns_green, ew_green, yellow_time, all_red_time)
+                tuple per intersection, in seconds
+        """
+        timings = np.asarray(timings, dtype=np.float64).reshape(-1, 4)
+        ns_green, ew_green, yellow_time, all_red_time = timings.T
+
+        # Phase durations per intersection, in _PHASE_NAMES order
+        self.durations = np.column_stack(
+            (ns_green, yellow_time, all_red_time, ew_green, yellow_time, all_red_time)
+        )
+        self.phase_index = np.zeros(len(timings), dtype=np.int32)
+        self.time_in_phase = np.zeros(len(timings), dtype=np.float64)
+
+        self._state_matrix = np.array(_PHASE_STATES, dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return len(self.phase_index)
+
+    def step_all(self, time_step: float = 1.0):
+        """
+        Advance every controller by one time step.
+
+        Args:
+            time_step: Time interval (seconds)
+        """
+        self.time_in_phase += time_step
+
+        current = np.take_along_axis(self.durations, self.phase_index[:, None], axis=1).ravel()
+        wrap = self.time_in_phase >= current
+
+        np.add(self.phase_index, 1, out=self.phase_index, where=wrap)
+        self.phase_index[self.phase_index == len(_PHASE_STATES)] = 0
+        self.time_in_phase[wrap] = 0.0
+
+    def get_light_states_all(self) -> np.ndarray:
+        """
+        Get current light codes for all controllers.
+
+        Returns:
+            Array of shape (N, 4) with codes into LIGHT_STATES, columns
+            ordered north, south, east, west
+        """
+        return self._state_matrix[self.phase_index]
+
+    def reset(self):
+        """Reset all controllers to the start of their cycle"""
+        self.phase_index.fill(0)
+        self.time_in_phase.fill(0.0)
+
+
 if __name__ == "__main__":
     # Test the fixed-time controller
     logging.basicConfig(level=logging.INFO)
@@ -4,11 +4,13 @@ Traffic Scenarios for Testing and Comparison
 Defines various traffic patterns for evaluating controller performance.
 """
 
-from typing import Dict
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Mapping
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TrafficScenario:
     """Defines a traffic scenario with arrival rates"""
     name: str
@@ -162,19 +164,13 @@ class Scenarios:
         )
 
     @staticmethod
-    def all_scenarios() -> Dict[str, TrafficScenario]:
-        """Get all predefined scenarios as a dictionary"""
-        return {
-            'normal': Scenarios.normal_traffic(),
-            'rush_ns': Scenarios.rush_hour_ns(),
-            'rush_ew': Scenarios.rush_hour_ew(),
-            'light': Scenarios.light_traffic(),
-            'asymmetric_north': Scenarios.asymmetric_heavy_north(),
-            'peak': Scenarios.peak_congestion(),
-            'morning': Scenarios.morning_commute(),
-            'evening': Scenarios.evening_commute(),
-            'weekend': Scenarios.weekend_leisure()
-        }
+    def all_scenarios() -> Mapping[str, TrafficScenario]:
+        """
+        Get all predefined scenarios as a read-only mapping.
+
+        The scenarios are built once and shared between calls.
+        """
+        return _all_scenarios()
 
     @staticmethod
     def get_scenario(name: str) -> TrafficScenario:
@@ -198,6 +194,22 @@ class Scenarios:
         return scenarios[name]
 
 
+@lru_cache(maxsize=1)
+def _all_scenarios() -> Mapping[str, TrafficScenario]:
+    """Build the predefined scenarios once (see Scenarios.all_scenarios)"""
+    return MappingProxyType({
+        'normal': Scenarios.normal_traffic(),
+        'rush_ns': Scenarios.rush_hour_ns(),
+        'rush_ew': Scenarios.rush_hour_ew(),
+        'light': Scenarios.light_traffic(),
+        'asymmetric_north': Scenarios.asymmetric_heavy_north(),
+        'peak': Scenarios.peak_congestion(),
+        'morning': Scenarios.morning_commute(),
+        'evening': Scenarios.evening_commute(),
+        'weekend': Scenarios.weekend_leisure()
+    })
+
+
 if __name__ == "__main__":
     print("=" * 70)
     print("TRAFFIC SCENARIOS")
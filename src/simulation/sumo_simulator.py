@@ -1,13 +1,19 @@
 """
 SUMO Traffic Simulator Integration
 Connects fuzzy traffic controller to SUMO via TraCI API
+
+Two backends are supported: ``traci`` (socket connection, works with
+sumo-gui) and ``libsumo`` (SUMO loaded in-process, headless only, much
+lower per-call overhead). Both expose the same API.
 """
 
 import os
 import sys
-from typing import Dict, List, Tuple
+from typing import Dict
 from dataclasses import dataclass
 
+import numpy as np
+
 try:
     import traci
     TRACI_AVAILABLE = True
@@ -15,6 +21,12 @@ except ImportError:
     TRACI_AVAILABLE = False
     print("Warning: TraCI not available. Install with: pip install traci")
 
+try:
+    import libsumo
+    LIBSUMO_AVAILABLE = True
+except ImportError:
+    LIBSUMO_AVAILABLE = False
+
 
 @dataclass
 class SUMOMetrics:
@@ -44,7 +56,8 @@ class SUMOSimulator:
         sumo_cfg: str,
         tls_id: str = "center",
         use_gui: bool = True,
-        step_length: float = 1.0
+        step_length: float = 1.0,
+        backend: str = "traci"
     ):
         """
         Initialize SUMO simulator
@@ -54,10 +67,26 @@ class SUMOSimulator:
             tls_id: Traffic light system ID (junction name)
             use_gui: Whether to use SUMO-GUI (visual) or sumo (headless)
             step_length: Simulation step length in seconds
+            backend: "traci" or "libsumo". libsumo runs SUMO in-process and
+                has no GUI, so use_gui is ignored; falls back to traci when
+                libsumo is not installed.
         """
-        if not TRACI_AVAILABLE:
+        if backend not in ("traci", "libsumo"):
+            raise ValueError(f"Invalid backend: {backend}. Must be 'traci' or 'libsumo'")
+
+        if backend == "libsumo" and not LIBSUMO_AVAILABLE:
+            print("Warning: libsumo not available, falling back to traci")
+            backend = "traci"
+
+        if backend == "traci" and not TRACI_AVAILABLE:
             raise ImportError("TraCI not installed. Run: pip install traci")
 
+        self.backend = backend
+        self.traci = libsumo if backend == "libsumo" else traci
+        if backend == "libsumo":
+            # libsumo has no GUI
+            use_gui = False
+
         self.sumo_cfg = sumo_cfg
         self.tls_id = tls_id
         self.use_gui = use_gui
@@ -71,6 +100,15 @@ class SUMOSimulator:
             'west': 'west_in'
         }
 
+        # Fixed (direction, edge) order, and buffers reused by get_traffic_state
+        self._edges = tuple(self.direction_map.items())
+        self._densities = np.empty(len(self._edges))
+        self._waiting_times = np.empty(len(self._edges))
+        self._state_template = {
+            direction: {'density': 0, 'waiting_time': 0.0}
+            for direction, _ in self._edges
+        }
+
         # Traffic light phases (SUMO uses phases for signal states)
         # Phase 0: North-South green
         # Phase 2: East-West green
@@ -79,15 +117,9 @@ class SUMOSimulator:
             'east_west': 2
         }
 
-        # Metrics tracking
-        self.total_waiting_time = 0.0
-        self.vehicle_count = 0
-        self.waiting_times: Dict[str, List[float]] = {
-            'north': [], 'south': [], 'east': [], 'west': []
-        }
-        self.queue_lengths: Dict[str, List[int]] = {
-            'north': [], 'south': [], 'east': [], 'west': []
-        }
+        # Metrics tracking: running per-direction accumulators (in
+        # direction_map order), so memory stays constant over long runs
+        self.reset_metrics()
 
     def start(self):
         """Start SUMO simulation"""
@@ -95,22 +127,73 @@ class SUMOSimulator:
         sumo_cmd = [sumo_binary, "-c", self.sumo_cfg, "--step-length", str(self.step_length)]
 
         try:
-            traci.start(sumo_cmd)
-            print(f"SUMO started: {sumo_binary}")
+            self.traci.start(sumo_cmd)
+            self._bind_traci()
+            self._subscribe_edges()
+            self._subscribe_simulation()
+            print(f"SUMO started: {sumo_binary} ({self.backend})")
             print(f"Configuration: {self.sumo_cfg}")
             print(f"Traffic light ID: {self.tls_id}")
         except Exception as e:
             raise RuntimeError(f"Failed to start SUMO: {e}")
 
+    def _bind_traci(self):
+        """Bind the TraCI calls made every step, to skip repeated attribute lookups"""
+        self._simulation_step = self.traci.simulationStep
+        self._edge_results = self.traci.edge.getAllSubscriptionResults
+        self._simulation_results = self.traci.simulation.getSubscriptionResults
+        self._set_phase = self.traci.trafficlight.setPhase
+        self._set_phase_duration = self.traci.trafficlight.setPhaseDuration
+
+    def _subscribe_edges(self):
+        """
+        Subscribe to per-edge vehicle count and total waiting time.
+
+        SUMO then pushes both values for every incoming edge once per
+        simulation step, instead of one query per vehicle.
+        """
+        tc = self.traci.constants
+        self._edge_vars = (tc.LAST_STEP_VEHICLE_NUMBER, tc.VAR_WAITING_TIME)
+        for edge_id in self.direction_map.values():
+            self.traci.edge.subscribe(edge_id, self._edge_vars)
+
+    def _subscribe_simulation(self):
+        """
+        Subscribe to simulation time and departed/arrived vehicle counts.
+
+        The values arrive with every simulation step, so the getters below
+        read them locally instead of each making a round-trip.
+        """
+        tc = self.traci.constants
+        self._sim_vars = (tc.VAR_TIME,
+                          tc.VAR_DEPARTED_VEHICLES_NUMBER,
+                          tc.VAR_ARRIVED_VEHICLES_NUMBER)
+        self.traci.simulation.subscribe(self._sim_vars)
+
+    def _simulation_value(self, index: int, query):
+        """
+        Subscribed simulation value, or a direct query before the first step
+        """
+        results = self._simulation_results()
+        value = results.get(self._sim_vars[index]) if results else None
+        return query() if value is None else value
+
     def step(self, num_steps: int = 1):
         """Execute simulation steps"""
-        for _ in range(num_steps):
-            traci.simulationStep()
+        if num_steps <= 0:
+            return
+        if num_steps == 1:
+            self._simulation_step()
+            return
+
+        # Advance to the absolute target time in a single call
+        target_time = self.get_simulation_time() + num_steps * self.step_length
+        self._simulation_step(target_time)
 
     def close(self):
         """Close SUMO simulation"""
         try:
-            traci.close()
+            self.traci.close()
             print("SUMO closed")
         except Exception as e:
             print(f"Error closing SUMO: {e}")
@@ -126,36 +209,56 @@ class SUMOSimulator:
                 'south': {'density': 10, 'waiting_time': 18.0},
                 ...
             }
+
+            The same dictionary is updated in place on every call; copy it
+            if values must be kept across steps.
+        """
+        densities = self._densities
+        waiting_times = self._waiting_times
+        self.get_traffic_state_into(densities, waiting_times)
+
+        state = self._state_template
+        for i, (direction, _) in enumerate(self._edges):
+            direction_state = state[direction]
+            direction_state['density'] = int(densities[i])
+            direction_state['waiting_time'] = float(waiting_times[i])
+
+        return state
+
+    def get_traffic_state_into(self, densities: np.ndarray, waiting_times: np.ndarray):
         """
-        state = {}
+        Write current traffic state into preallocated arrays
 
-        for direction, edge_id in self.direction_map.items():
-            # Get vehicles on this edge
-            vehicle_ids = traci.edge.getLastStepVehicleIDs(edge_id)
+        Allocation-free variant of get_traffic_state for control loops.
+
+        Args:
+            densities: Output array of vehicle counts, ordered north, south, east, west
+            waiting_times: Output array of average waiting times, same order
+        """
+        vehicle_var, waiting_var = self._edge_vars
+        results = self._edge_results()
+
+        for i, (_, edge_id) in enumerate(self._edges):
+            edge_results = results.get(edge_id, {})
 
             # Calculate density (number of vehicles)
-            density = len(vehicle_ids)
-
-            # Calculate average waiting time for vehicles on this edge
-            if vehicle_ids:
-                waiting_times = [
-                    traci.vehicle.getWaitingTime(veh_id)
-                    for veh_id in vehicle_ids
-                ]
-                avg_waiting_time = sum(waiting_times) / len(waiting_times)
+            density = edge_results.get(vehicle_var, 0)
+
+            # Edge waiting time is the sum over its vehicles; average it
+            if density > 0:
+                avg_waiting_time = edge_results.get(waiting_var, 0.0) / density
             else:
                 avg_waiting_time = 0.0
 
-            state[direction] = {
-                'density': density,
-                'waiting_time': avg_waiting_time
-            }
+            densities[i] = density
+            waiting_times[i] = avg_waiting_time
 
-            # Track metrics
-            self.waiting_times[direction].append(avg_waiting_time)
-            self.queue_lengths[direction].append(density)
-
-        return state
+        # Track metrics
+        self._samples += 1
+        self._waiting_sum += waiting_times
+        np.maximum(self._waiting_max, waiting_times, out=self._waiting_max)
+        self._queue_sum += densities
+        np.maximum(self._queue_max, densities, out=self._queue_max)
 
     def set_green_time(self, direction: str, duration: int):
         """
@@ -172,14 +275,14 @@ class SUMOSimulator:
             phase_index = self.phases['east_west']
 
         # Set traffic light phase
-        traci.trafficlight.setPhase(self.tls_id, phase_index)
+        self._set_phase(self.tls_id, phase_index)
 
         # Hold green for specified duration
-        traci.trafficlight.setPhaseDuration(self.tls_id, duration)
+        self._set_phase_duration(self.tls_id, duration)
 
     def get_current_phase(self) -> str:
         """Get current traffic light phase"""
-        phase_index = traci.trafficlight.getPhase(self.tls_id)
+        phase_index = self.traci.trafficlight.getPhase(self.tls_id)
 
         if phase_index == self.phases['north_south']:
             return 'north_south'
@@ -190,19 +293,19 @@ class SUMOSimulator:
 
     def get_simulation_time(self) -> float:
         """Get current simulation time in seconds"""
-        return traci.simulation.getTime()
+        return self._simulation_value(0, self.traci.simulation.getTime)
 
     def get_vehicle_count(self) -> int:
         """Get total number of vehicles in simulation"""
-        return traci.vehicle.getIDCount()
+        return self.traci.vehicle.getIDCount()
 
     def get_departed_vehicles(self) -> int:
         """Get number of vehicles that have departed"""
-        return traci.simulation.getDepartedNumber()
+        return self._simulation_value(1, self.traci.simulation.getDepartedNumber)
 
     def get_arrived_vehicles(self) -> int:
         """Get number of vehicles that have arrived (completed journey)"""
-        return traci.simulation.getArrivedNumber()
+        return self._simulation_value(2, self.traci.simulation.getArrivedNumber)
 
     def calculate_metrics(self) -> SUMOMetrics:
         """
@@ -211,21 +314,15 @@ class SUMOSimulator:
         Returns:
             SUMOMetrics object with comprehensive performance data
         """
-        # Aggregate waiting times across all directions
-        all_waiting_times = []
-        for direction_times in self.waiting_times.values():
-            all_waiting_times.extend(direction_times)
-
-        # Aggregate queue lengths
-        all_queue_lengths = []
-        for direction_queues in self.queue_lengths.values():
-            all_queue_lengths.extend(direction_queues)
+        # Every direction is sampled once per state read
+        n_samples = self._samples * len(self.direction_map)
+        total_waiting = float(self._waiting_sum.sum())
 
         # Calculate averages
-        avg_waiting = sum(all_waiting_times) / len(all_waiting_times) if all_waiting_times else 0.0
-        max_waiting = max(all_waiting_times) if all_waiting_times else 0.0
-        avg_queue = sum(all_queue_lengths) / len(all_queue_lengths) if all_queue_lengths else 0.0
-        max_queue = max(all_queue_lengths) if all_queue_lengths else 0.0
+        avg_waiting = total_waiting / n_samples if n_samples else 0.0
+        max_waiting = float(self._waiting_max.max()) if n_samples else 0.0
+        avg_queue = float(self._queue_sum.sum()) / n_samples if n_samples else 0.0
+        max_queue = int(self._queue_max.max()) if n_samples else 0.0
 
         # Throughput: vehicles that completed journey
         total_vehicles = self.get_departed_vehicles()
@@ -236,15 +333,17 @@ class SUMOSimulator:
         throughput = (arrived_vehicles / simulation_time * 3600) if simulation_time > 0 else 0.0
 
         # Calculate fairness index (Jain's Fairness Index)
-        direction_avg_waiting = [
-            sum(times) / len(times) if times else 0.0
-            for times in self.waiting_times.values()
-        ]
-
-        if direction_avg_waiting and sum(direction_avg_waiting) > 0:
-            numerator = sum(direction_avg_waiting) ** 2
-            denominator = len(direction_avg_waiting) * sum(t ** 2 for t in direction_avg_waiting)
-            fairness = numerator / denominator if denominator > 0 else 1.0
+        direction_avg_waiting = (
+            self._waiting_sum / self._samples if self._samples
+            else np.zeros(len(self.direction_map))
+        )
+
+        # Jain's fairness index: (sum x)^2 / (n * sum x^2)
+        total = float(direction_avg_waiting.sum())
+        if total > 0:
+            denominator = len(direction_avg_waiting) * float(
+                np.dot(direction_avg_waiting, direction_avg_waiting))
+            fairness = total ** 2 / denominator if denominator > 0 else 1.0
         else:
             fairness = 1.0
 
@@ -255,16 +354,20 @@ class SUMOSimulator:
             max_queue_length=max_queue,
             throughput=throughput,
             total_vehicles=total_vehicles,
-            total_waiting_time=sum(all_waiting_times),
+            total_waiting_time=total_waiting,
             fairness_index=fairness
         )
 
     def reset_metrics(self):
         """Reset metric tracking"""
+        n_directions = len(self.direction_map)
         self.total_waiting_time = 0.0
         self.vehicle_count = 0
-        self.waiting_times = {k: [] for k in self.waiting_times}
-        self.queue_lengths = {k: [] for k in self.queue_lengths}
+        self._samples = 0
+        self._waiting_sum = np.zeros(n_directions)
+        self._waiting_max = np.zeros(n_directions)
+        self._queue_sum = np.zeros(n_directions)
+        self._queue_max = np.zeros(n_directions)
 
 
 def check_sumo_installation() -> bool:
@@ -274,7 +377,7 @@ def check_sumo_installation() -> bool:
     Returns:
         True if SUMO is available, False otherwise
     """
-    if not TRACI_AVAILABLE:
+    if not TRACI_AVAILABLE and not LIBSUMO_AVAILABLE:
         print("TraCI Python module not found")
         print("Install with: pip install traci")
         return False
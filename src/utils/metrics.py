@@ -4,46 +4,131 @@ Performance Metrics Calculator
 Calculates and tracks performance metrics for traffic control systems.
 """
 
+import math
+import sys
 import numpy as np
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
 from dataclasses import dataclass, field
-import pandas as pd
 
+if TYPE_CHECKING:
+    import pandas as pd
 
-@dataclass
+
+# Sign applied to (baseline - current) in compare_with, per compared metric
+_IMPROVEMENT_SIGNS = np.array([1.0, 1.0, -1.0, 1.0])
+
+
+def _ensure_capacity(buffer: np.ndarray, count: int, needed: int) -> np.ndarray:
+    """
+    Return buffer, or a larger copy of its first count entries if it cannot
+    hold needed entries (grows by doubling).
+    """
+    if needed <= len(buffer):
+        return buffer
+    grown = np.empty(max(needed, 2 * len(buffer), 256), dtype=buffer.dtype)
+    grown[:count] = buffer[:count]
+    return grown
+
+
+@dataclass(slots=True)
 class DirectionMetrics:
     """Performance metrics for one direction"""
     direction: str
     total_arrivals: int = 0
     total_departures: int = 0
-    waiting_times: List[float] = field(default_factory=list)
-    queue_lengths: List[int] = field(default_factory=list)
     green_times: List[float] = field(default_factory=list)
+    keep_samples: bool = False  # Keep individual waiting times (for distributions)
+
+    # Running waiting time statistics, so aggregates need no rescans
+    _waiting_count: int = field(default=0, repr=False)
+    _waiting_sum: float = field(default=0.0, repr=False)
+    _waiting_max: float = field(default=0.0, repr=False)
+
+    # With keep_samples, waiting times also live in a contiguous buffer that
+    # grows by doubling; only the first _sample_count entries are valid
+    _waiting_buffer: np.ndarray = field(default_factory=lambda: np.empty(0), repr=False)
+    _sample_count: int = field(default=0, repr=False)
+
+    # Queue length samples, same buffer scheme
+    _queue_buffer: np.ndarray = field(
+        default_factory=lambda: np.empty(0, dtype=np.int32), repr=False)
+    _queue_count: int = field(default=0, repr=False)
+
+    @property
+    def waiting_times(self) -> np.ndarray:
+        """Waiting times of departed vehicles in departure order (empty unless keep_samples)"""
+        return self._waiting_buffer[:self._sample_count]
+
+    def add_waiting_time(self, waiting_time: float):
+        """Add one waiting time; scalar counterpart of add_waiting_times"""
+        waiting_time = float(waiting_time)
+        self._waiting_count += 1
+        self._waiting_sum += waiting_time
+        if waiting_time > self._waiting_max:
+            self._waiting_max = waiting_time
+
+        if self.keep_samples:
+            count = self._sample_count
+            self._waiting_buffer = _ensure_capacity(self._waiting_buffer, count, count + 1)
+            self._waiting_buffer[count] = waiting_time
+            self._sample_count = count + 1
+
+    def add_waiting_times(self, waiting_times: Sequence[float]):
+        """Add waiting times to the running statistics (and the buffer, if kept)"""
+        if not len(waiting_times):
+            return
+        values = np.asarray(waiting_times, dtype=np.float64)
+        self._waiting_count += len(values)
+        self._waiting_sum += float(values.sum())
+        self._waiting_max = max(self._waiting_max, float(values.max()))
+
+        if self.keep_samples:
+            end = self._sample_count + len(values)
+            self._waiting_buffer = _ensure_capacity(self._waiting_buffer, self._sample_count, end)
+            self._waiting_buffer[self._sample_count:end] = values
+            self._sample_count = end
+
+    @property
+    def queue_lengths(self) -> np.ndarray:
+        """Queue length samples, in recording order"""
+        return self._queue_buffer[:self._queue_count]
+
+    def reserve_queue_lengths(self, num_samples: int):
+        """Preallocate room for num_samples queue length samples"""
+        self._queue_buffer = _ensure_capacity(self._queue_buffer, self._queue_count, num_samples)
+
+    def add_queue_length(self, queue_length: int):
+        """Append one queue length sample"""
+        count = self._queue_count
+        if count == len(self._queue_buffer):
+            self._queue_buffer = _ensure_capacity(self._queue_buffer, count, count + 1)
+        self._queue_buffer[count] = queue_length
+        self._queue_count = count + 1
 
     @property
     def average_waiting_time(self) -> float:
         """Average waiting time for departed vehicles"""
-        return np.mean(self.waiting_times) if self.waiting_times else 0.0
+        return self._waiting_sum / self._waiting_count if self._waiting_count else 0.0
 
     @property
     def max_waiting_time(self) -> float:
         """Maximum waiting time"""
-        return max(self.waiting_times) if self.waiting_times else 0.0
+        return self._waiting_max
 
     @property
     def average_queue_length(self) -> float:
         """Average queue length over time"""
-        return np.mean(self.queue_lengths) if self.queue_lengths else 0.0
+        return np.mean(self.queue_lengths) if self._queue_count else 0.0
 
     @property
     def max_queue_length(self) -> int:
         """Maximum queue length observed"""
-        return max(self.queue_lengths) if self.queue_lengths else 0
+        return int(self.queue_lengths.max()) if self._queue_count else 0
 
     @property
     def total_delay(self) -> float:
         """Total delay time (sum of all waiting times)"""
-        return sum(self.waiting_times)
+        return self._waiting_sum
 
     @property
     def throughput(self) -> int:
@@ -65,24 +150,55 @@ class PerformanceMetrics:
     - Fairness index
     """
 
-    def __init__(self, simulation_duration: float = 3600):
+    def __init__(self, simulation_duration: float = 3600, keep_samples: bool = False,
+                 time_step: float = 1.0):
         """
         Initialize performance metrics tracker.
 
         Args:
             simulation_duration: Total simulation duration in seconds
+            keep_samples: Also keep every individual waiting time (see
+                DirectionMetrics.waiting_times); aggregates never need them
+            time_step: Expected interval between queue samples (seconds),
+                used to preallocate the time series
         """
         self.simulation_duration = simulation_duration
         self.directions: Dict[str, DirectionMetrics] = {
-            'north': DirectionMetrics('north'),
-            'south': DirectionMetrics('south'),
-            'east': DirectionMetrics('east'),
-            'west': DirectionMetrics('west')
+            d: DirectionMetrics(d, keep_samples=keep_samples)
+            for d in ['north', 'south', 'east', 'west']
         }
 
-        # Time series data
-        self.timestamps: List[float] = []
-        self.total_queue_history: List[int] = []
+        # Time series data, preallocated for one sample per time step; only
+        # the first _num_samples entries are valid
+        num_samples = max(int(math.ceil(simulation_duration / time_step)), 0)
+        self._timestamp_buffer = np.empty(num_samples)
+        self._total_queue_buffer = np.empty(num_samples, dtype=np.int32)
+        self._num_samples = 0
+
+        # Directions in (north, south, east, west) order
+        self._direction_list = [self.directions[d] for d in ['north', 'south', 'east', 'west']]
+        for dir_metrics in self._direction_list:
+            dir_metrics.reserve_queue_lengths(num_samples)
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Times of the recorded queue samples"""
+        return self._timestamp_buffer[:self._num_samples]
+
+    @property
+    def total_queue_history(self) -> np.ndarray:
+        """Total queue length over all directions at each sample"""
+        return self._total_queue_buffer[:self._num_samples]
+
+    def _add_sample(self, timestamp: float, total_queue: int):
+        """Append one entry to the time series"""
+        i = self._num_samples
+        if i == len(self._timestamp_buffer):
+            self._timestamp_buffer = _ensure_capacity(self._timestamp_buffer, i, i + 1)
+            self._total_queue_buffer = _ensure_capacity(self._total_queue_buffer, i, i + 1)
+        self._timestamp_buffer[i] = timestamp
+        self._total_queue_buffer[i] = total_queue
+        self._num_samples = i + 1
 
     def record_timestep(self, timestamp: float, traffic_state: Dict):
         """
@@ -92,19 +208,29 @@ class PerformanceMetrics:
             timestamp: Current simulation time
             traffic_state: Current traffic state from simulator
         """
-        self.timestamps.append(timestamp)
-
-        total_queue = 0
-        for direction in ['north', 'south', 'east', 'west']:
-            dir_metrics = self.directions[direction]
-
-            # Record queue length
-            if 'queue_lengths' in traffic_state:
-                queue_len = traffic_state['queue_lengths'].get(direction, 0)
-                dir_metrics.queue_lengths.append(queue_len)
-                total_queue += queue_len
+        if 'queue_lengths' in traffic_state:
+            queue_lengths = traffic_state['queue_lengths']
+            self.record_queue_lengths(
+                timestamp,
+                [queue_lengths.get(d, 0) for d in ['north', 'south', 'east', 'west']]
+            )
+        else:
+            self._add_sample(timestamp, 0)
+
+    def record_queue_lengths(self, timestamp: float, queue_lengths: Sequence[int]):
+        """
+        Record queue lengths for a single timestep without building a state dict.
 
-        self.total_queue_history.append(total_queue)
+        Args:
+            timestamp: Current simulation time
+            queue_lengths: Queue length per direction, in (north, south, east,
+                west) order
+        """
+        total = 0
+        for dir_metrics, queue_len in zip(self._direction_list, queue_lengths):
+            dir_metrics.add_queue_length(queue_len)
+            total += queue_len
+        self._add_sample(timestamp, total)
 
     def record_departure(self, direction: str, waiting_time: float):
         """
@@ -114,8 +240,21 @@ class PerformanceMetrics:
             direction: Direction the vehicle departed from
             waiting_time: Total waiting time of the vehicle
         """
-        self.directions[direction].waiting_times.append(waiting_time)
-        self.directions[direction].total_departures += 1
+        dir_metrics = self.directions[direction]
+        dir_metrics.add_waiting_time(waiting_time)
+        dir_metrics.total_departures += 1
+
+    def record_departures(self, direction: str, waiting_times: Sequence[float]):
+        """
+        Record several vehicle departures from one direction at once.
+
+        Args:
+            direction: Direction the vehicles departed from
+            waiting_times: Total waiting time of each vehicle
+        """
+        dir_metrics = self.directions[direction]
+        dir_metrics.add_waiting_times(waiting_times)
+        dir_metrics.total_departures += len(waiting_times)
 
     def record_arrival(self, direction: str):
         """
@@ -158,10 +297,8 @@ class PerformanceMetrics:
     @property
     def average_waiting_time(self) -> float:
         """Overall average waiting time across all directions"""
-        all_waiting_times = []
-        for dir_metrics in self.directions.values():
-            all_waiting_times.extend(dir_metrics.waiting_times)
-        return np.mean(all_waiting_times) if all_waiting_times else 0.0
+        count = sum(d._waiting_count for d in self.directions.values())
+        return self.total_delay / count if count else 0.0
 
     @property
     def max_waiting_time(self) -> float:
@@ -177,12 +314,12 @@ class PerformanceMetrics:
     @property
     def average_queue_length(self) -> float:
         """Average total queue length across all directions"""
-        return np.mean(self.total_queue_history) if self.total_queue_history else 0.0
+        return np.mean(self.total_queue_history) if self._num_samples else 0.0
 
     @property
     def max_queue_length(self) -> int:
         """Maximum total queue length observed"""
-        return max(self.total_queue_history) if self.total_queue_history else 0
+        return int(self.total_queue_history.max()) if self._num_samples else 0
 
     @property
     def throughput_per_hour(self) -> float:
@@ -199,15 +336,17 @@ class PerformanceMetrics:
 
         Value ranges from 0 to 1, where 1 is perfectly fair.
         """
-        avg_waiting_times = [d.average_waiting_time for d in self.directions.values()
-                            if d.total_departures > 0]
+        avg_waiting_times = np.fromiter(
+            (d.average_waiting_time for d in self.directions.values() if d.total_departures > 0),
+            dtype=np.float64
+        )
 
-        if not avg_waiting_times or len(avg_waiting_times) < 2:
+        if avg_waiting_times.size < 2:
             return 1.0
 
-        n = len(avg_waiting_times)
-        sum_x = sum(avg_waiting_times)
-        sum_x_squared = sum(x**2 for x in avg_waiting_times)
+        n = avg_waiting_times.size
+        sum_x = float(avg_waiting_times.sum())
+        sum_x_squared = float(np.square(avg_waiting_times).sum())
 
         if sum_x_squared == 0:
             return 1.0
@@ -220,11 +359,11 @@ class PerformanceMetrics:
         """
         System utilization rate (percentage of time with vehicles in system).
         """
-        if not self.total_queue_history:
+        if not self._num_samples:
             return 0.0
 
-        non_zero_steps = sum(1 for q in self.total_queue_history if q > 0)
-        return non_zero_steps / len(self.total_queue_history) if self.total_queue_history else 0.0
+        non_zero_steps = int(np.count_nonzero(self.total_queue_history > 0))
+        return non_zero_steps / self._num_samples
 
     def get_summary(self) -> Dict:
         """
@@ -271,13 +410,18 @@ class PerformanceMetrics:
 
         return summary
 
-    def to_dataframe(self) -> pd.DataFrame:
+    def to_dataframe(self) -> "pd.DataFrame":
         """
         Convert metrics to pandas DataFrame for analysis.
 
+        pandas is imported here rather than at module load, since it is
+        only needed for this conversion.
+
         Returns:
             DataFrame with per-direction metrics
         """
+        import pandas as pd
+
         data = []
         for direction, metrics in self.directions.items():
             data.append({
@@ -304,27 +448,22 @@ class PerformanceMetrics:
         Returns:
             Dictionary showing improvements (positive = better)
         """
+        # Columns: waiting time, queue length, throughput, delay. Throughput
+        # is better when higher, so its difference is taken the other way.
+        baseline = np.array([other.average_waiting_time, other.average_queue_length,
+                             other.throughput_per_hour, other.total_delay], dtype=np.float64)
+        current = np.array([self.average_waiting_time, self.average_queue_length,
+                            self.throughput_per_hour, self.total_delay], dtype=np.float64)
+        difference = (baseline - current) * _IMPROVEMENT_SIGNS
+        improvement = np.divide(difference, baseline, out=np.zeros(4),
+                                where=baseline > 0) * 100
+        waiting, queue, throughput, delay = improvement.tolist()
+
         comparison = {
-            'waiting_time_improvement_%': (
-                (other.average_waiting_time - self.average_waiting_time) /
-                other.average_waiting_time * 100
-                if other.average_waiting_time > 0 else 0
-            ),
-            'queue_length_improvement_%': (
-                (other.average_queue_length - self.average_queue_length) /
-                other.average_queue_length * 100
-                if other.average_queue_length > 0 else 0
-            ),
-            'throughput_improvement_%': (
-                (self.throughput_per_hour - other.throughput_per_hour) /
-                other.throughput_per_hour * 100
-                if other.throughput_per_hour > 0 else 0
-            ),
-            'delay_reduction_%': (
-                (other.total_delay - self.total_delay) /
-                other.total_delay * 100
-                if other.total_delay > 0 else 0
-            ),
+            'waiting_time_improvement_%': waiting,
+            'queue_length_improvement_%': queue,
+            'throughput_improvement_%': throughput,
+            'delay_reduction_%': delay,
             'fairness_improvement': self.fairness_index - other.fairness_index
         }
 
@@ -332,43 +471,45 @@ class PerformanceMetrics:
 
     def print_summary(self, title: str = "Performance Metrics"):
         """Print a formatted summary of metrics"""
-        print("=" * 70)
-        print(f"{title}")
-        print("=" * 70)
-
         summary = self.get_summary()
 
-        print(f"\nOverall Metrics:")
-        print(f"  Simulation Duration:    {summary['simulation_duration']:.0f}s "
-              f"({summary['simulation_duration']/3600:.1f}h)")
-        print(f"  Total Arrivals:         {summary['total_arrivals']}")
-        print(f"  Total Departures:       {summary['total_departures']}")
-        print(f"  Vehicles in System:     {summary['vehicles_in_system']}")
-        print(f"  Throughput:             {summary['throughput_per_hour']:.1f} vehicles/hour")
-
-        print(f"\nWaiting Time Metrics:")
-        print(f"  Average Waiting Time:   {summary['average_waiting_time']:.2f}s")
-        print(f"  Maximum Waiting Time:   {summary['max_waiting_time']:.2f}s")
-        print(f"  Total Delay:            {summary['total_delay']:.0f}s "
-              f"({summary['total_delay']/3600:.1f}h)")
-
-        print(f"\nQueue Metrics:")
-        print(f"  Average Queue Length:   {summary['average_queue_length']:.2f} vehicles")
-        print(f"  Maximum Queue Length:   {summary['max_queue_length']} vehicles")
-
-        print(f"\nPerformance Indices:")
-        print(f"  Fairness Index:         {summary['fairness_index']:.3f} (1.0 = perfect)")
-        print(f"  Utilization Rate:       {summary['utilization_rate']:.1%}")
-
-        print(f"\nPer-Direction Metrics:")
+        # Build the whole report first so it is written in a single call
+        lines = [
+            "=" * 70,
+            f"{title}",
+            "=" * 70,
+            f"\nOverall Metrics:",
+            f"  Simulation Duration:    {summary['simulation_duration']:.0f}s "
+            f"({summary['simulation_duration']/3600:.1f}h)",
+            f"  Total Arrivals:         {summary['total_arrivals']}",
+            f"  Total Departures:       {summary['total_departures']}",
+            f"  Vehicles in System:     {summary['vehicles_in_system']}",
+            f"  Throughput:             {summary['throughput_per_hour']:.1f} vehicles/hour",
+            f"\nWaiting Time Metrics:",
+            f"  Average Waiting Time:   {summary['average_waiting_time']:.2f}s",
+            f"  Maximum Waiting Time:   {summary['max_waiting_time']:.2f}s",
+            f"  Total Delay:            {summary['total_delay']:.0f}s "
+            f"({summary['total_delay']/3600:.1f}h)",
+            f"\nQueue Metrics:",
+            f"  Average Queue Length:   {summary['average_queue_length']:.2f} vehicles",
+            f"  Maximum Queue Length:   {summary['max_queue_length']} vehicles",
+            f"\nPerformance Indices:",
+            f"  Fairness Index:         {summary['fairness_index']:.3f} (1.0 = perfect)",
+            f"  Utilization Rate:       {summary['utilization_rate']:.1%}",
+            f"\nPer-Direction Metrics:",
+        ]
         for direction, metrics in summary['by_direction'].items():
-            print(f"\n  {direction.upper()}:")
-            print(f"    Arrivals:           {metrics['arrivals']}")
-            print(f"    Departures:         {metrics['departures']}")
-            print(f"    Avg Waiting Time:   {metrics['avg_waiting_time']:.2f}s")
-            print(f"    Max Waiting Time:   {metrics['max_waiting_time']:.2f}s")
-            print(f"    Avg Queue Length:   {metrics['avg_queue_length']:.2f}")
-            print(f"    Max Queue Length:   {metrics['max_queue_length']}")
+            lines.extend((
+                f"\n  {direction.upper()}:",
+                f"    Arrivals:           {metrics['arrivals']}",
+                f"    Departures:         {metrics['departures']}",
+                f"    Avg Waiting Time:   {metrics['avg_waiting_time']:.2f}s",
+                f"    Max Waiting Time:   {metrics['max_waiting_time']:.2f}s",
+                f"    Avg Queue Length:   {metrics['avg_queue_length']:.2f}",
+                f"    Max Queue Length:   {metrics['max_queue_length']}",
+            ))
+
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":
@@ -2,8 +2,10 @@
 import sys
 sys.path.insert(0, 'src')
 
+import numpy as np
+
 from fuzzy_controller.controller import FuzzyTrafficController
-from simulation.traffic_model import TrafficSimulator, LightState
+from simulation.traffic_model import TrafficSimulator
 from simulation.scenarios import Scenarios
 from utils.metrics import PerformanceMetrics
 
@@ -20,51 +22,21 @@ simulator = TrafficSimulator(
 controller = FuzzyTrafficController(enable_logging=False)
 metrics = PerformanceMetrics(simulation_duration=60)
 
-# Initialize
-current_phase = 'init'
-phase_start_time = 0.0
-phase_duration = 0.0
+# Fixed 20s phases starting with NS green, as a (steps, 4) green schedule
+# in (north, south, east, west) order
 time_step = 1.0
-
-for _ in range(60):  # 60 steps
-    traffic_state = simulator.get_traffic_state()
-    
-    # Simple phase control
-    time_in_phase = simulator.current_time - phase_start_time
-    
-    if time_in_phase >= phase_duration:
-        if current_phase == 'init' or current_phase == 'ew_green':
-            # NS green
-            ns_green = 20
-            phase_duration = ns_green
-            phase_start_time = simulator.current_time
-            current_phase = 'ns_green'
-            simulator.set_all_lights({
-                'north': LightState.GREEN,
-                'south': LightState.GREEN,
-                'east': LightState.RED,
-                'west': LightState.RED
-            })
-        elif current_phase == 'ns_green':
-            # EW green
-            ew_green = 20
-            phase_duration = ew_green
-            phase_start_time = simulator.current_time
-            current_phase = 'ew_green'
-            simulator.set_all_lights({
-                'north': LightState.RED,
-                'south': LightState.RED,
-                'east': LightState.GREEN,
-                'west': LightState.GREEN
-            })
-    
-    # Step
-    simulator.step(time_step)
-    
-    # Record departures
-    for direction, dir_state in simulator.directions.items():
-        for vehicle in dir_state.recent_departures:
-            metrics.record_departure(direction, vehicle.waiting_time)
+phase_duration = 20
+ns_green = [True, True, False, False]
+ew_green = [False, False, True, True]
+phases = np.array([ns_green, ew_green, ns_green], dtype=bool)
+green_schedule = np.repeat(phases, phase_duration, axis=0)[:60]  # 60 steps
+
+# Run all steps in one batch
+simulator.run(green_schedule, time_step)
+
+# Record departures (run keeps every departure of the batch)
+for direction, dir_state in simulator.directions.items():
+    metrics.record_departures(direction, dir_state.recent_waiting_times())
 
 # Check results
 stats = simulator.get_statistics()
@@ -39,7 +39,9 @@ except Exception as e:
 print("\n[3/5] Testing Fuzzy Controller...")
 try:
     from fuzzy_controller.controller import FuzzyTrafficController
-    controller = FuzzyTrafficController(enable_logging=False)
+    # Reuse the variables and rules built in tests 1 and 2
+    controller = FuzzyTrafficController(enable_logging=False, antecedents=antecedents,
+                                        consequent=consequent, all_rules=all_rules)
 
     # Test computation
     traffic_state = {
@@ -48,6 +50,15 @@ try:
     }
     green_time = controller.compute_green_time('north', traffic_state)
     print(f"✓ Fuzzy controller working (sample output: {green_time:.1f}s)")
+
+    # Vectorized engine must agree with skfuzzy's reference inference
+    reference = FuzzyTrafficController(enable_logging=False, cache_tolerance=None,
+                                       fast_inference=False, antecedents=antecedents,
+                                       consequent=consequent, all_rules=all_rules)
+    reference_time = reference.compute_green_time('north', traffic_state)
+    assert abs(green_time - reference_time) < 0.1, \
+        f"fast engine {green_time:.2f}s vs skfuzzy {reference_time:.2f}s"
+    print(f"✓ Fast engine matches skfuzzy (reference: {reference_time:.1f}s)")
 except Exception as e:
     print(f"✗ Error: {e}")
     sys.exit(1)
@@ -0,0 +1,111 @@
+"""
+Component tests
+
+pytest version of the test_system.py checks. Membership functions, rules
+and the fuzzy controller are built once per module and shared.
+"""
+
+import numpy as np
+import pytest
+
+from fuzzy_controller.controller import FuzzyTrafficController, TrafficStateArray
+from fuzzy_controller.fuzzy_rules import create_all_fuzzy_rules
+from fuzzy_controller.membership_functions import create_membership_functions
+from simulation.fixed_controller import FixedTimeController
+from simulation.scenarios import Scenarios
+from simulation.traffic_model import LightState, TrafficSimulator
+
+TRAFFIC_STATE = {
+    'density': {'north': 75, 'south': 30, 'east': 50, 'west': 40},
+    'waiting_time': {'north': 120, 'south': 45, 'east': 80, 'west': 60}
+}
+
+
+@pytest.fixture(scope='module')
+def variables():
+    return create_membership_functions()
+
+
+@pytest.fixture(scope='module')
+def rule_graph(variables):
+    antecedents, consequent = variables
+    return create_all_fuzzy_rules(antecedents, consequent)
+
+
+@pytest.fixture(scope='module')
+def controller(variables, rule_graph):
+    antecedents, consequent = variables
+    return FuzzyTrafficController(enable_logging=False, antecedents=antecedents,
+                                  consequent=consequent, all_rules=rule_graph)
+
+
+def test_membership_functions(variables):
+    antecedents, consequent = variables
+    assert len(antecedents) == 8
+    assert consequent.label == 'green_time'
+
+
+def test_fuzzy_rules(rule_graph):
+    assert list(rule_graph) == ['north', 'south', 'east', 'west']
+    assert all(len(rules) > 0 for rules in rule_graph.values())
+
+
+def test_fuzzy_controller(controller, variables, rule_graph):
+    green_time = controller.compute_green_time('north', TRAFFIC_STATE)
+    universe = controller.consequent.universe
+    assert universe[0] <= green_time <= universe[-1]
+
+    # Vectorized engine must agree with skfuzzy's reference inference
+    antecedents, consequent = variables
+    reference = FuzzyTrafficController(enable_logging=False, cache_tolerance=None,
+                                       fast_inference=False, antecedents=antecedents,
+                                       consequent=consequent, all_rules=rule_graph)
+    assert green_time == pytest.approx(
+        reference.compute_green_time('north', TRAFFIC_STATE), abs=0.1)
+
+
+def test_traffic_simulator():
+    sim = TrafficSimulator(
+        arrival_rates={'north': 10, 'south': 10, 'east': 10, 'west': 10},
+        simulation_duration=60,
+        random_seed=42
+    )
+
+    for _ in range(10):
+        sim.set_light_state('north', LightState.GREEN)
+        sim.step(1.0)
+
+    stats = sim.get_statistics()
+    assert stats['simulation_time'] == 10.0
+    assert stats['total_arrivals'] > 0
+    assert stats['vehicles_in_system'] == stats['total_arrivals'] - stats['total_departures']
+
+
+def test_fixed_time_controller():
+    fixed = FixedTimeController(ns_green=40, ew_green=40)
+    states = fixed.get_light_states()
+    assert set(states) == {'north', 'south', 'east', 'west'}
+    assert fixed.cycle_duration > 80
+
+
+def test_scenarios():
+    assert len(Scenarios.all_scenarios()) > 0
+
+
+def test_skfuzzy_path_survives_simulation_flush(controller, variables, rule_graph):
+    # skfuzzy clears the simulation's inputs every 1000 computes; results
+    # past that point must still match the vectorized engine
+    antecedents, consequent = variables
+    reference = FuzzyTrafficController(enable_logging=False, cache_tolerance=None,
+                                       fast_inference=False, antecedents=antecedents,
+                                       consequent=consequent, all_rules=rule_graph)
+    rng = np.random.default_rng(0)
+    directions = ['north', 'south', 'east', 'west']
+    for _ in range(260):  # 1040 computes
+        state = TrafficStateArray(rng.integers(0, 100, 4).astype(float),
+                                  rng.integers(0, 300, 4).astype(float))
+        for direction in directions:
+            expected = controller.engine.compute(controller._input_vector(state),
+                                                 directions.index(direction))
+            assert reference.compute_green_time(direction, state) == pytest.approx(
+                expected, abs=0.1)